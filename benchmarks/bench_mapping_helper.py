@@ -0,0 +1,65 @@
+"""
+Micro-benchmark for MappingHelper.add_mapping.
+
+Feeds the full, distance-sorted candidate list of two synthetic 1k-corner
+shapes (1k x 1k = 1M candidate pairs) through the greedy mapper, the same way
+Morph.do_mapping does.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_mapping_helper [--features 1000] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+
+from geometry.rounded_polygon import Feature
+from geometry.polygon_measure import MeasuredFeature
+from morph.bezier_morph import DistanceVertex, MappingHelper
+
+
+def make_features(count: int, rng: random.Random):
+    progresses = sorted(rng.random() for _ in range(count))
+    return [MeasuredFeature(p, Feature(curves=[], type="corner")) for p in progresses]
+
+
+def make_candidates(features1, features2, rng: random.Random):
+    candidates = [
+        DistanceVertex(rng.random(), f1, f2) for f1 in features1 for f2 in features2
+    ]
+    candidates.sort(key=lambda x: x.distance)
+    return candidates
+
+
+def run(feature_count: int, repeat: int, seed: int) -> None:
+    rng = random.Random(seed)
+    features1 = make_features(feature_count, rng)
+    features2 = make_features(feature_count, rng)
+    candidates = make_candidates(features1, features2, rng)
+
+    print(f"{len(features1)} x {len(features2)} = {len(candidates)} candidate pairs")
+
+    best = float("inf")
+    for run_index in range(repeat):
+        helper = MappingHelper()
+        start = time.perf_counter()
+        for dv in candidates:
+            helper.add_mapping(dv.f1, dv.f2)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        print(
+            f"run {run_index}: {elapsed * 1000:.1f} ms, "
+            f"{len(helper.mapping)} anchors accepted"
+        )
+
+    print(f"best: {best * 1000:.1f} ms ({best / len(candidates) * 1e9:.0f} ns/candidate)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--features", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.features, args.repeat, args.seed)
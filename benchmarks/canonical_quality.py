@@ -0,0 +1,104 @@
+"""
+Quality and cost of CanonicalShape pairing compared with Morph.match.
+
+For each transition of the AnimateShapeMorph preset cycle (or all preset pairs
+with --all-pairs), both morphs are evaluated at a few progress values and the
+outlines compared. Deviation is the symmetric Hausdorff distance between the
+sampled outlines, in shape units (500 = full widget side).
+
+Usage (from the repository root):
+    python -m benchmarks.canonical_quality [--segments 96] [--all-pairs]
+"""
+
+import argparse
+import itertools
+import time
+
+from morph.bezier_morph import Morph
+from morph.canonical import CanonicalShape
+from benchmarks.common import load_presets, preset_polygon
+
+# same order as AnimateShapeMorph.presets
+ANIMATION_CYCLE = [
+    "circle", "square", "slanted", "arch", "semicircle", "oval", "pill",
+    "triangle", "arrow", "diamond", "clamshell", "pentagon", "gem", "cookie_8",
+    "shield", "four_leaf_clover", "boom", "puffy_diamond", "concave_rectangle",
+    "ghost_ish", "pixel_circle", "pixel_triangle", "bun", "heart",
+]  # fmt: skip
+
+PROGRESS_VALUES = (0.25, 0.5, 0.75)
+SAMPLES_PER_CUBIC = 8
+
+
+def outline_points(cubics):
+    return [
+        c.point_at(i / SAMPLES_PER_CUBIC)
+        for c in cubics
+        for i in range(SAMPLES_PER_CUBIC)
+    ]
+
+
+def hausdorff(a, b) -> float:
+    def one_way(src, dst):
+        return max(min(p.dist_to(q) for q in dst) for p in src)
+
+    return max(one_way(a, b), one_way(b, a))
+
+
+def run(segment_count: int, all_pairs: bool) -> None:
+    presets = load_presets()
+    names = list(presets) if all_pairs else ANIMATION_CYCLE
+    if all_pairs:
+        transitions = list(itertools.product(names, names))
+    else:
+        transitions = [(n, names[(i + 1) % len(names)]) for i, n in enumerate(names)]
+
+    polygons = {n: preset_polygon(presets[n]) for n in names}
+
+    start = time.perf_counter()
+    canonical = {
+        n: CanonicalShape.from_polygon(p, segment_count) for n, p in polygons.items()
+    }
+    canonical_setup = time.perf_counter() - start
+
+    print(f"{'transition':<36} | {'pairs':>5} | {'max dev':>8} | {'mean dev':>8}")
+    print("-" * 68)
+
+    match_setup = 0.0
+    deviations = []
+    for a, b in transitions:
+        start = time.perf_counter()
+        pairs = Morph.match(polygons[a], polygons[b])
+        match_setup += time.perf_counter() - start
+
+        devs = [
+            hausdorff(
+                outline_points(Morph.as_cubics(pairs, t)),
+                outline_points(CanonicalShape.interpolate(canonical[a], canonical[b], t)),
+            )
+            for t in PROGRESS_VALUES
+        ]
+        deviations.extend(devs)
+        print(
+            f"{a + ' -> ' + b:<36} | {len(pairs):>5} | "
+            f"{max(devs):>8.2f} | {sum(devs) / len(devs):>8.2f}"
+        )
+
+    print("-" * 68)
+    print(f"transitions:              {len(transitions)}")
+    print(f"Morph.match setup:        {match_setup * 1000:.1f} ms total")
+    print(
+        f"canonical setup:          {canonical_setup * 1000:.1f} ms total "
+        f"({len(canonical)} shapes, {segment_count} segments)"
+    )
+    print(f"max deviation:            {max(deviations):.2f}")
+    print(f"mean deviation:           {sum(deviations) / len(deviations):.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=CanonicalShape.DEFAULT_SEGMENT_COUNT)
+    parser.add_argument("--all-pairs", action="store_true")
+    args = parser.parse_args()
+
+    run(args.segments, args.all_pairs)
@@ -0,0 +1,16 @@
+"""Helpers shared by the benchmark scripts."""
+
+from typing import Dict
+
+from geometry.rounded_polygon import RoundedPolygon
+from shapes import preset_registry
+from shapes.preset_registry import UnitData
+
+
+def load_presets() -> Dict[str, UnitData]:
+    """Every preset defined in shapes/shape_presets.py, by name."""
+    return {name: preset_registry.unit_data(name) for name in preset_registry.names()}
+
+
+def preset_polygon(unit_data: UnitData, size=500, margin=50) -> RoundedPolygon:
+    return RoundedPolygon.from_unit_data(unit_data, size, margin)
@@ -0,0 +1,244 @@
+"""
+Golden-output regression check for the preset morphs.
+
+`record` matches every ordered preset pair with Morph.match and stores, per
+pair, the matched cubic pairs and the outline of the morph at a few progress
+values (Morph.as_cubics sampled at SAMPLE_TS per cubic). `check` recomputes the
+same output and compares it with the stored one: a pair fails if its number of
+matched pairs changed or any point moved more than --tolerance pixels. The
+report gives the maximum deviation per source preset and overall, and the exit
+status is 1 if any pair failed.
+
+Record on a known-good tree before changing Morph.match, LengthMeasurer,
+RoundedCorner and friends, then check after each change.
+
+Golden files are one per source preset (<dir>/<name>.golden). Coordinates are
+quantized to 1/--resolution pixels and zlib-compressed, so the tolerance must
+stay above half a quantization step.
+
+Usage (from the repository root):
+    python -m benchmarks.golden_morphs record [--dir benchmarks/golden] [--resolution 1024]
+    python -m benchmarks.golden_morphs check [--dir benchmarks/golden] [--tolerance 0.01]
+        [--presets circle heart ...]
+"""
+
+import argparse
+import array
+import math
+import os
+import struct
+import sys
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from geometry.bezier_geometry import Cubic
+from morph.bezier_morph import Morph
+from benchmarks.common import load_presets, preset_polygon
+
+MAGIC = b"CSGD"
+VERSION = 1
+
+# magic, version, progress count, sample count, resolution, entry count
+FILE_HEADER = struct.Struct("<4sHHHxxdI")
+# name length, matched pair count (-1: match raised), point count
+ENTRY_HEADER = struct.Struct("<Hii")
+
+PROGRESS_VALUES = (0.25, 0.5, 0.75)
+SAMPLE_TS = (0.0, 0.5)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+MATCH_FAILED = -1
+
+
+@dataclass
+class GoldenEntry:
+    """The recorded output of one transition: its pair count and all its points."""
+
+    target: str
+    pair_count: int
+    points: Sequence[float]  # flat x, y in pixels: pair control points, then samples
+
+
+def morph_points(pairs) -> List[float]:
+    points = Cubic.to_coords([c for pair in pairs for c in pair])
+    for progress in PROGRESS_VALUES:
+        for cubic in Morph.as_cubics(pairs, progress):
+            for t in SAMPLE_TS:
+                p = cubic.point_at(t)
+                points.extend((p.x, p.y))
+    return points
+
+
+def compute(source: str, targets: List[str], polygons) -> List[GoldenEntry]:
+    entries = []
+    for target in targets:
+        if target == source:
+            continue
+        try:
+            pairs = Morph.match(polygons[source], polygons[target])
+        except Exception:
+            entries.append(GoldenEntry(target, MATCH_FAILED, []))
+            continue
+        entries.append(GoldenEntry(target, len(pairs), morph_points(pairs)))
+    return entries
+
+
+def dump(entries: List[GoldenEntry], resolution: float) -> bytes:
+    header = [
+        FILE_HEADER.pack(
+            MAGIC, VERSION, len(PROGRESS_VALUES), len(SAMPLE_TS), resolution, len(entries)
+        )
+    ]
+    values = array.array("i")
+    for entry in entries:
+        name = entry.target.encode()
+        header.append(ENTRY_HEADER.pack(len(name), entry.pair_count, len(entry.points) // 2))
+        header.append(name)
+        values.extend(round(v * resolution) for v in entry.points)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return b"".join(header) + zlib.compress(values.tobytes(), 9)
+
+
+def load(data: bytes) -> Tuple[float, List[GoldenEntry]]:
+    magic, version, progress_count, sample_count, resolution, count = (
+        FILE_HEADER.unpack_from(data)
+    )
+    if magic != MAGIC:
+        raise ValueError("not a golden morph file")
+    if version != VERSION:
+        raise ValueError(f"unsupported golden file version {version}")
+    if progress_count != len(PROGRESS_VALUES) or sample_count != len(SAMPLE_TS):
+        raise ValueError("golden file was recorded with different sampling, re-record it")
+
+    offset = FILE_HEADER.size
+    layout = []
+    for _ in range(count):
+        name_length, pair_count, point_count = ENTRY_HEADER.unpack_from(data, offset)
+        offset += ENTRY_HEADER.size
+        name = data[offset : offset + name_length].decode()
+        offset += name_length
+        layout.append((name, pair_count, point_count))
+
+    values = array.array("i")
+    values.frombytes(zlib.decompress(data[offset:]))
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    entries = []
+    start = 0
+    for name, pair_count, point_count in layout:
+        end = start + point_count * 2
+        entries.append(
+            GoldenEntry(name, pair_count, [v / resolution for v in values[start:end]])
+        )
+        start = end
+    return resolution, entries
+
+
+def max_deviation(a: Sequence[float], b: Sequence[float]) -> float:
+    return max(
+        (math.hypot(a[i] - b[i], a[i + 1] - b[i + 1]) for i in range(0, len(a), 2)),
+        default=0.0,
+    )
+
+
+def golden_path(directory: str, source: str) -> str:
+    return os.path.join(directory, f"{source}.golden")
+
+
+def record(directory: str, names: List[str], resolution: float) -> None:
+    presets = load_presets()
+    polygons = {name: preset_polygon(presets[name]) for name in presets}
+    targets = list(presets)
+    os.makedirs(directory, exist_ok=True)
+
+    total = 0
+    for source in names:
+        data = dump(compute(source, targets, polygons), resolution)
+        with open(golden_path(directory, source), "wb") as f:
+            f.write(data)
+        total += len(data)
+    print(f"recorded {len(names)} presets x {len(targets) - 1} targets, {total / 1024:.0f} KiB")
+
+
+def check(directory: str, names: List[str], tolerance: float) -> bool:
+    presets = load_presets()
+    polygons = {name: preset_polygon(presets[name]) for name in presets}
+
+    ok = True
+    worst = 0.0
+    print(f"{'source':<22} | {'pairs':>5} | {'max dev px':>10} | status")
+    print("-" * 56)
+    for source in names:
+        path = golden_path(directory, source)
+        if not os.path.exists(path):
+            print(f"{source:<22} | {'-':>5} | {'-':>10} | no golden file")
+            ok = False
+            continue
+        with open(path, "rb") as f:
+            resolution, golden = load(f.read())
+        if tolerance < 0.5 / resolution:
+            raise ValueError(
+                f"tolerance {tolerance} px is below the recorded precision "
+                f"({0.5 / resolution:.2g} px)"
+            )
+
+        current: Dict[str, GoldenEntry] = {
+            e.target: e for e in compute(source, [e.target for e in golden], polygons)
+        }
+        source_worst = 0.0
+        failures = []
+        for expected in golden:
+            actual = current[expected.target]
+            if actual.pair_count != expected.pair_count:
+                failures.append(
+                    f"{source}->{expected.target}: "
+                    f"{expected.pair_count} pairs, now {actual.pair_count}"
+                )
+                continue
+            deviation = max_deviation(expected.points, actual.points)
+            source_worst = max(source_worst, deviation)
+            if deviation > tolerance:
+                failures.append(f"{source}->{expected.target}: moved {deviation:.4f} px")
+
+        worst = max(worst, source_worst)
+        ok = ok and not failures
+        status = f"{len(failures)} FAILED" if failures else "ok"
+        print(f"{source:<22} | {len(golden):>5} | {source_worst:>10.4f} | {status}")
+        for failure in failures:
+            print(f"    {failure}")
+
+    print(f"max deviation: {worst:.4f} px (tolerance {tolerance} px)")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="write the golden files")
+    record_parser.add_argument(
+        "--resolution", type=float, default=1024.0, help="quantization steps per pixel"
+    )
+
+    check_parser = commands.add_parser("check", help="compare against the golden files")
+    check_parser.add_argument("--tolerance", type=float, default=0.01, help="pixels")
+
+    for sub in (record_parser, check_parser):
+        sub.add_argument("--dir", default=DEFAULT_DIR)
+        sub.add_argument("--presets", nargs="+", help="source presets, default all")
+
+    args = parser.parse_args(argv)
+    names = args.presets or list(load_presets())
+
+    if args.command == "record":
+        record(args.dir, names, args.resolution)
+        return 0
+    return 0 if check(args.dir, names, args.tolerance) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Import time of the headless core, and a guard that it never pulls in GTK.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+The script reports its cumulative import time and fails (exit status 1) if
+any of them imports a GUI module (gi, cairo) or exceeds the time budget. CI
+runs it without PyGObject/pycairo installed.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time [--budget-ms 250] [--runs 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# modules that must import without a display or GUI toolkit
+HEADLESS_MODULES = [
+    "geometry.rounded_polygon",
+    "morph.bezier_morph",
+    "morph.canonical",
+    "morph.sequence",
+    "morph.cache",
+    "morph.service",
+    "morph.serialization",
+    "shapes",
+    "shapes.shape_presets",
+    "shapes.preset_registry",
+    "morph_daemon",
+]
+
+FORBIDDEN = ("gi", "cairo")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds per imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented name>"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(module: str, runs: int) -> Tuple[float, List[str]]:
+    best = None
+    forbidden = []
+    for _ in range(runs):
+        times = import_times(module)
+        forbidden = sorted(n for n in times if n.split(".")[0] in FORBIDDEN)
+        total = times.get(module, 0) / 1000
+        best = total if best is None else min(best, total)
+    return best, forbidden
+
+
+def run(budget_ms: float, runs: int) -> bool:
+    ok = True
+    print(f"{'module':<28} | {'import ms':>9} | status")
+    print("-" * 52)
+    for module in HEADLESS_MODULES:
+        elapsed, forbidden = measure(module, runs)
+        if forbidden:
+            status = "imports " + ", ".join(forbidden)
+        elif elapsed > budget_ms:
+            status = f"over budget ({budget_ms:.0f} ms)"
+        else:
+            status = "ok"
+        ok = ok and status == "ok"
+        print(f"{module:<28} | {elapsed:>9.1f} | {status}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=250.0)
+    parser.add_argument("--runs", type=int, default=3, help="best of N fresh imports")
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.budget_ms, args.runs) else 1)
@@ -0,0 +1,239 @@
+"""
+Memory footprint of preset polygons, their measurements and their morphs.
+
+For each preset, tracemalloc measures the bytes retained by its RoundedPolygon,
+by its MeasuredPolygon (beyond the polygon it measures) and by the result of
+Morph.match against every other preset, plus the peak allocated while matching.
+The retained objects are then walked and broken down by type (Point, Cubic,
+MeasuredCubic, Feature, ...). Objects reachable from the call's inputs are not
+counted, so shared inputs such as the source polygon's cubics are not charged
+to the MeasuredPolygon or the match.
+
+Instance sizes of the geometry dataclasses are calibrated with tracemalloc too
+(instance plus its attribute storage, without the objects it refers to); other
+objects use sys.getsizeof. Whatever the walk does not account for (allocator
+overhead, caches) is shown as "unattributed".
+
+Usage (from the repository root):
+    python -m benchmarks.memory_report [--presets circle heart ...] [--json out.json]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from geometry.polygon_measure import MeasuredPolygon
+from geometry.rounded_polygon import RoundedPolygon
+from morph.bezier_morph import Morph
+from benchmarks.common import load_presets
+
+CALIBRATION_COUNT = 2000
+
+# builtin containers the walk looks into, besides geometry/morph objects
+CONTAINERS = (list, tuple, dict, set, frozenset)
+
+# bytes per type name: [count, bytes]
+Breakdown = Dict[str, List[int]]
+
+_instance_sizes: Dict[type, float] = {}
+
+
+def instance_size(obj) -> float:
+    """
+    Bytes of one instance of obj's dataclass, traced, with its attribute storage.
+    Other classes (a handful per polygon or morph) use sys.getsizeof; reading their
+    __dict__ to find the attribute names would allocate a dict they don't have.
+    """
+    cls = type(obj)
+    fields = getattr(cls, "__dataclass_fields__", None)
+    if fields is None:
+        return sys.getsizeof(obj)
+    if cls not in _instance_sizes:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        instances = []
+        for _ in range(CALIBRATION_COUNT):
+            instance = cls.__new__(cls)
+            for name in fields:
+                object.__setattr__(instance, name, None)
+            instances.append(instance)
+        after = tracemalloc.get_traced_memory()[0]
+        _instance_sizes[cls] = (after - before - sys.getsizeof(instances)) / len(instances)
+    return _instance_sizes[cls]
+
+
+def _is_model(obj) -> bool:
+    return type(obj).__module__.split(".")[0] in ("geometry", "morph")
+
+
+def _walk(roots, skip=frozenset()):
+    """Yields the objects reachable from roots through model objects and containers."""
+    seen = set(skip)
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        yield obj
+        if _is_model(obj) or isinstance(obj, CONTAINERS):
+            stack.extend(gc.get_referents(obj))
+
+
+def reachable(*roots) -> set:
+    return {id(obj) for obj in _walk(roots)}
+
+
+def breakdown(root, inputs: set) -> Breakdown:
+    """Objects reachable from root but not from the inputs, by type."""
+    result: Breakdown = defaultdict(lambda: [0, 0])
+    for obj in _walk([root], inputs):
+        size = instance_size(obj) if _is_model(obj) else sys.getsizeof(obj)
+        entry = result[type(obj).__name__]
+        entry[0] += 1
+        entry[1] += size
+    return dict(result)
+
+
+def traced(fn: Callable[[], object]) -> Tuple[object, int, int]:
+    """fn's result, the bytes it still holds after gc, and the peak while it ran."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    return result, retained - before, peak - before
+
+
+def add_breakdown(total: Breakdown, part: Breakdown, retained: int) -> None:
+    for name, (count, size) in part.items():
+        entry = total.setdefault(name, [0, 0])
+        entry[0] += count
+        entry[1] += size
+    unattributed = retained - sum(size for _, size in part.values())
+    entry = total.setdefault("unattributed", [0, 0])
+    entry[1] += unattributed
+
+
+def run(names: List[str]) -> dict:
+    presets = load_presets()
+    polygons = {}
+    rows = []
+    kinds = ("polygon", "measured", "match")
+    totals: Dict[str, Breakdown] = {kind: {} for kind in kinds}
+    counts = {kind: 0 for kind in kinds}
+
+    preset_objects = reachable(presets)
+    polygon_objects = {}
+    for name in presets:
+        polygon, retained, peak = traced(
+            lambda: RoundedPolygon.from_unit_data(presets[name], 500, 50)
+        )
+        polygons[name] = polygon
+        polygon_objects[name] = reachable(polygon)
+        if name in names:
+            add_breakdown(totals["polygon"], breakdown(polygon, preset_objects), retained)
+            counts["polygon"] += 1
+            rows.append({"preset": name, "polygon": retained, "polygon_peak": peak})
+
+    for row in rows:
+        name = row["preset"]
+        measured, retained, peak = traced(
+            lambda: MeasuredPolygon.measure_polygon(polygons[name])
+        )
+        inputs = preset_objects | polygon_objects[name]
+        add_breakdown(totals["measured"], breakdown(measured, inputs), retained)
+        counts["measured"] += 1
+        row["measured"] = retained
+        row["measured_peak"] = peak
+        del measured
+
+        match_retained = []
+        match_peaks = []
+        for target in presets:
+            if target == name:
+                continue
+            pairs, retained, peak = traced(
+                lambda: Morph.match(polygons[name], polygons[target])
+            )
+            inputs = preset_objects | polygon_objects[name] | polygon_objects[target]
+            add_breakdown(totals["match"], breakdown(pairs, inputs), retained)
+            counts["match"] += 1
+            match_retained.append(retained)
+            match_peaks.append(peak)
+            del pairs
+        row["match_mean"] = sum(match_retained) / len(match_retained)
+        row["match_max"] = max(match_retained)
+        row["match_peak"] = max(match_peaks)
+
+    return {"rows": rows, "types": totals, "counts": counts}
+
+
+def kib(value: float) -> str:
+    return f"{value / 1024:.1f}"
+
+
+def print_report(report: dict, cache_size: int) -> None:
+    rows = report["rows"]
+    print(
+        f"{'preset':<22} | {'polygon':>8} | {'measured':>8} | {'match avg':>9} | "
+        f"{'match max':>9} | {'match peak':>10}"
+    )
+    print(f"{'':<22} | {'KiB':>8} | {'KiB':>8} | {'KiB':>9} | {'KiB':>9} | {'KiB':>10}")
+    print("-" * 84)
+    for row in rows:
+        print(
+            f"{row['preset']:<22} | {kib(row['polygon']):>8} | {kib(row['measured']):>8} | "
+            f"{kib(row['match_mean']):>9} | {kib(row['match_max']):>9} | "
+            f"{kib(row['match_peak']):>10}"
+        )
+
+    print()
+    kinds = list(report["types"])
+    names = sorted(
+        {name for totals in report["types"].values() for name in totals},
+        key=lambda n: -sum(report["types"][k].get(n, [0, 0])[1] for k in kinds),
+    )
+    print("mean per object, by type (count / KiB)")
+    print(f"{'type':<16} | " + " | ".join(f"{kind:>16}" for kind in kinds))
+    print("-" * (19 + 19 * len(kinds)))
+    for name in names:
+        cells = []
+        for kind in kinds:
+            count, size = report["types"][kind].get(name, [0, 0])
+            n = report["counts"][kind] or 1
+            cells.append(f"{count / n:>7.1f} / {kib(size / n):>6}")
+        print(f"{name:<16} | " + " | ".join(f"{cell:>16}" for cell in cells))
+
+    if rows:
+        mean_match = sum(r["match_mean"] for r in rows) / len(rows)
+        print()
+        print(
+            f"{cache_size} cached morphs of the average preset pair: "
+            f"{mean_match * cache_size / 1024 / 1024:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--presets", nargs="+", help="subset of preset names")
+    parser.add_argument(
+        "--cache-size", type=int, default=500, help="morph count for the cache estimate"
+    )
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    report = run(args.presets or list(load_presets()))
+    tracemalloc.stop()
+
+    print_report(report, args.cache_size)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
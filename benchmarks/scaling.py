@@ -0,0 +1,231 @@
+"""
+Time and memory of the hot paths against polygon size, on synthetic polygons.
+
+For each vertex count n (default 10 to 100k) and each generator in
+benchmarks/synthetic.py, times RoundedPolygon.create, measure_polygon,
+Morph.match (against another polygon of the same kind and size) and
+Morph.as_cubics, and reports the tracemalloc peak of each. The `exp` column is
+the growth exponent between consecutive sizes (log t2/t1 / log n2/n1), so an
+accidental O(n^2) path shows up as ~2 long before it hurts.
+
+An operation is skipped at sizes where its time, extrapolated from the last two
+sizes, would exceed --budget-s seconds (or once it did exceed it). An operation
+that raises is reported as an error and not run at larger sizes.
+
+Usage (from the repository root):
+    python -m benchmarks.scaling [--sizes 10 100 1000 10000 100000]
+        [--kinds star comb jagged] [--ops create measure match as_cubics]
+        [--budget-s 20] [--no-memory] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from geometry.polygon_measure import MeasuredPolygon
+from geometry.rounded_polygon import RoundedPolygon
+from morph.bezier_morph import Morph
+from benchmarks import synthetic
+
+OPS = ("create", "measure", "match", "as_cubics")
+SIZES = [10, 100, 1000, 10_000, 100_000]
+
+PROGRESS = 0.5
+
+
+# fast calls are repeated (best of) until this much time was spent on them
+REPEAT_S = 0.2
+MAX_REPEAT = 5
+
+
+def timed(fn: Callable[[], object]) -> Tuple[object, float]:
+    """The result of fn and its best time; slow calls run only once."""
+    best = float("inf")
+    spent = 0.0
+    for _ in range(MAX_REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent >= REPEAT_S:
+            break
+    return result, best
+
+
+def peak_bytes(fn: Callable[[], object]) -> int:
+    """tracemalloc peak of one call above what was allocated before it."""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+class Budget:
+    """Decides whether an operation is still worth running at the next size."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.history: Dict[str, List[Tuple[int, float]]] = {}
+        self.failed = set()
+
+    def estimate(self, op: str, n: int) -> Optional[float]:
+        points = self.history.get(op, [])
+        if not points:
+            return None
+        n1, t1 = points[-1]
+        exponent = 1.0
+        if len(points) > 1:
+            exponent = max(1.0, growth_exponent(points[-2], points[-1]) or 1.0)
+        return t1 * (n / n1) ** exponent
+
+    def allows(self, op: str, n: int) -> bool:
+        if op in self.failed:
+            return False
+        estimate = self.estimate(op, n)
+        return estimate is None or estimate <= self.seconds
+
+    def fail(self, op: str):
+        self.failed.add(op)
+
+    def add(self, op: str, n: int, seconds: float):
+        self.history.setdefault(op, []).append((n, seconds))
+
+
+def growth_exponent(a: Tuple[int, float], b: Tuple[int, float]) -> Optional[float]:
+    (n1, t1), (n2, t2) = a, b
+    if t1 <= 0 or t2 <= 0 or n1 == n2:
+        return None
+    return math.log(t2 / t1) / math.log(n2 / n1)
+
+
+def run_kind(kind: str, sizes, ops, budget_s: float, memory: bool) -> List[dict]:
+    budget = Budget(budget_s)
+    rows = []
+    for n in sizes:
+        row = {"kind": kind, "n": n, "ops": {}}
+        rows.append(row)
+
+        data1 = synthetic.unit_data(kind, n, seed=0)
+        data2 = synthetic.unit_data(kind, n, seed=1)
+        verts1, rounding1 = RoundedPolygon.unit_vertices(data1, 500, 50)
+
+        def create():
+            return RoundedPolygon.create(verts1, per_vertex_rounding=rounding1)
+
+        # inputs of later ops are built whether or not the earlier ops are timed
+        poly1 = poly2 = pairs = None
+
+        def need_polygons():
+            nonlocal poly1, poly2
+            if poly1 is None:
+                poly1 = create()
+                poly2 = RoundedPolygon.from_unit_data(data2, 500, 50)
+
+        for op in ops:
+            if not budget.allows(op, n):
+                row["ops"][op] = {"skipped": budget.estimate(op, n)}
+                continue
+            # as_cubics needs a match, which may be far over budget by itself
+            if op == "as_cubics" and pairs is None and not budget.allows("match", n):
+                row["ops"][op] = {"skipped": None}
+                continue
+
+            try:
+                if op == "create":
+                    fn = create
+                elif op == "measure":
+                    need_polygons()
+                    fn = lambda: MeasuredPolygon.measure_polygon(poly1)
+                elif op == "match":
+                    need_polygons()
+                    fn = lambda: Morph.match(poly1, poly2)
+                else:
+                    need_polygons()
+                    if pairs is None:
+                        pairs = Morph.match(poly1, poly2)
+                    fn = lambda: Morph.as_cubics(pairs, PROGRESS)
+
+                result, seconds = timed(fn)
+            except Exception as e:
+                budget.fail(op)
+                row["ops"][op] = {"error": f"{type(e).__name__}: {e}"}
+                continue
+            if op == "match":
+                pairs = result
+            budget.add(op, n, seconds)
+            entry = {"seconds": seconds}
+            if memory:
+                entry["peak_bytes"] = peak_bytes(fn)
+            row["ops"][op] = entry
+
+        # exponents against the previous size
+        if len(rows) > 1:
+            previous = rows[-2]
+            for op, entry in row["ops"].items():
+                before = previous["ops"].get(op, {})
+                if "seconds" in entry and "seconds" in before:
+                    entry["exponent"] = growth_exponent(
+                        (previous["n"], before["seconds"]), (n, entry["seconds"])
+                    )
+    return rows
+
+
+def format_entry(entry: dict, memory: bool) -> str:
+    for status in ("skipped", "error"):
+        if status in entry:
+            return f"{status:>10}" + ("" if not memory else f"{'':>11}") + f"{'':>6}"
+    text = f"{entry['seconds'] * 1000:>10.2f}"
+    if memory:
+        text += f"{entry['peak_bytes'] / 1e6:>9.2f}MB"
+    exponent = entry.get("exponent")
+    text += f"{exponent:>6.2f}" if exponent is not None else f"{'':>6}"
+    return text
+
+
+def print_table(rows: List[dict], ops, memory: bool) -> None:
+    column = 27 if memory else 16
+    header = f"{'kind':<7} {'n':>7} |" + "|".join(f"{op:^{column}}" for op in ops)
+    units = f"{'':<7} {'':>7} |" + "|".join(
+        (f"{'ms':>10}{'peak':>11}{'exp':>6}" if memory else f"{'ms':>10}{'exp':>6}")
+        for _ in ops
+    )
+    print(header)
+    print(units)
+    print("-" * len(header))
+    for row in rows:
+        cells = [format_entry(row["ops"][op], memory) for op in ops]
+        print(f"{row['kind']:<7} {row['n']:>7} |" + "|".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument(
+        "--kinds", nargs="+", choices=list(synthetic.GENERATORS), default=list(synthetic.GENERATORS)
+    )
+    parser.add_argument("--ops", nargs="+", choices=OPS, default=list(OPS))
+    parser.add_argument("--budget-s", type=float, default=20.0, help="per operation and size")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args()
+
+    memory = not args.no_memory
+    rows = []
+    for kind in args.kinds:
+        rows.extend(run_kind(kind, sorted(args.sizes), args.ops, args.budget_s, memory))
+    print_table(rows, args.ops, memory)
+    for row in rows:
+        for op, entry in row["ops"].items():
+            if "error" in entry:
+                print(f"{row['kind']} n={row['n']} {op}: {entry['error']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=1)
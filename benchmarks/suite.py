@@ -0,0 +1,205 @@
+"""
+Timing suite for the geometry and morph hot paths, with JSON results.
+
+`run` times RoundedPolygon.create, MeasuredPolygon.measure_polygon and
+cut_and_shift for every preset in shapes/shape_presets.py, and Morph.match and
+Morph.as_cubics for every ordered preset pair. Each item is timed `--repeat`
+times and the best run kept. Results go to a JSON file (stdout with `-o -`).
+
+`compare` reads two result files and flags every operation whose total time
+grew by more than `--threshold` (default 10%). With `--items` it also lists the
+individual presets/pairs that regressed. The exit status is 1 if any operation
+regressed, so it can gate CI against a stored baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.suite run [-o results.json] [--repeat 5] [--ops match ...]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.1]
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from geometry.polygon_measure import MeasuredPolygon
+from geometry.rounded_polygon import RoundedPolygon
+from morph.bezier_morph import Morph
+from benchmarks.common import load_presets, preset_polygon
+
+FORMAT_VERSION = 1
+
+SHAPE_OPS = ("create", "measure", "cut_and_shift")
+PAIR_OPS = ("match", "as_cubics")
+OPS = SHAPE_OPS + PAIR_OPS
+
+CUT_POINT = 0.5
+PROGRESS = 0.5
+
+# per-item differences below this are timer noise, whatever the ratio
+MIN_ITEM_DELTA_MS = 0.05
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def time_presets(names: List[str], ops, repeat: int) -> Dict[str, Dict[str, float]]:
+    """{op: {item: best ms}} for the selected operations."""
+    presets = load_presets()
+    polygons = {name: preset_polygon(presets[name]) for name in names}
+    items: Dict[str, Dict[str, float]] = {op: {} for op in ops}
+
+    for name in names:
+        if "create" in ops:
+            verts, per_vertex = RoundedPolygon.unit_vertices(presets[name], 500, 50)
+            items["create"][name] = best_ms(
+                lambda: RoundedPolygon.create(verts, per_vertex_rounding=per_vertex),
+                repeat,
+            )
+        if "measure" in ops:
+            items["measure"][name] = best_ms(
+                lambda: MeasuredPolygon.measure_polygon(polygons[name]), repeat
+            )
+        if "cut_and_shift" in ops:
+            measured = MeasuredPolygon.measure_polygon(polygons[name])
+            items["cut_and_shift"][name] = best_ms(
+                lambda: measured.cut_and_shift(CUT_POINT), repeat
+            )
+
+    if "match" in ops or "as_cubics" in ops:
+        for name1, name2 in itertools.permutations(names, 2):
+            poly1, poly2 = polygons[name1], polygons[name2]
+            key = f"{name1}->{name2}"
+            if "match" in ops:
+                items["match"][key] = best_ms(lambda: Morph.match(poly1, poly2), repeat)
+            if "as_cubics" in ops:
+                pairs = Morph.match(poly1, poly2)
+                items["as_cubics"][key] = best_ms(
+                    lambda: Morph.as_cubics(pairs, PROGRESS), repeat
+                )
+
+    return items
+
+
+def run(names: List[str], ops, repeat: int) -> dict:
+    items = time_presets(names, ops, repeat)
+    return {
+        "version": FORMAT_VERSION,
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+            "presets": len(names),
+        },
+        "results": {
+            op: {"total_ms": sum(by_item.values()), "items": by_item}
+            for op, by_item in items.items()
+        },
+    }
+
+
+def print_summary(result: dict, out=sys.stderr) -> None:
+    print(f"{'operation':<14} | {'items':>6} | {'total ms':>10} | {'mean us':>9}", file=out)
+    print("-" * 48, file=out)
+    for op, entry in result["results"].items():
+        count = len(entry["items"])
+        mean_us = entry["total_ms"] / count * 1000 if count else 0.0
+        print(
+            f"{op:<14} | {count:>6} | {entry['total_ms']:>10.2f} | {mean_us:>9.1f}",
+            file=out,
+        )
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float, show_items: bool
+) -> bool:
+    """Prints the comparison; returns False if any operation regressed."""
+    ok = True
+    print(f"{'operation':<14} | {'base ms':>10} | {'new ms':>10} | {'change':>8} | status")
+    print("-" * 62)
+    for op, entry in current["results"].items():
+        base = baseline["results"].get(op)
+        if base is None:
+            print(f"{op:<14} | {'-':>10} | {entry['total_ms']:>10.2f} | {'-':>8} | new")
+            continue
+
+        # only items present in both runs, so --presets subsets stay comparable
+        common = entry["items"].keys() & base["items"].keys()
+        base_total = sum(base["items"][k] for k in common)
+        new_total = sum(entry["items"][k] for k in common)
+        change = new_total / base_total - 1 if base_total else 0.0
+        regressed = change > threshold
+        ok = ok and not regressed
+        status = "REGRESSION" if regressed else ("faster" if change < -threshold else "ok")
+        print(
+            f"{op:<14} | {base_total:>10.2f} | {new_total:>10.2f} | "
+            f"{change:>+7.1%} | {status}"
+        )
+
+        if show_items:
+            for key in sorted(common):
+                old, new = base["items"][key], entry["items"][key]
+                if new - old > MIN_ITEM_DELTA_MS and new > old * (1 + threshold):
+                    print(f"    {key:<40} {old:>8.3f} -> {new:>8.3f} ms")
+    return ok
+
+
+def load_result(path: str) -> dict:
+    with open(path) as f:
+        result = json.load(f)
+    if result.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported result version {result.get('version')}")
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the suite and write JSON")
+    run_parser.add_argument("-o", "--output", default="-", help="result file, - for stdout")
+    run_parser.add_argument("--repeat", type=int, default=5, help="best of N per item")
+    run_parser.add_argument("--ops", nargs="+", choices=OPS, default=list(OPS))
+    run_parser.add_argument("--presets", nargs="+", help="subset of preset names")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.add_argument("--items", action="store_true", help="list regressed items")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        names = args.presets or list(load_presets())
+        result = run(names, tuple(args.ops), args.repeat)
+        print_summary(result)
+        if args.output == "-":
+            json.dump(result, sys.stdout, indent=1)
+            sys.stdout.write("\n")
+        else:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=1)
+        return 0
+
+    ok = compare(
+        load_result(args.baseline), load_result(args.current), args.threshold, args.items
+    )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Synthetic RoundedPolygons of any size, for scaling benchmarks.
+
+All generators return preset-style unit data (a list of ((ux, uy), CornerRounding)
+in the unit square, like shapes/shape_presets.py), so they go through
+RoundedPolygon.from_unit_data the same way the presets do:
+
+    star     random star-shaped outline (sorted angles, random radii)
+    comb     rectangle with a zigzag top edge, half its corners concave
+    jagged   circle-ish outline with near-duplicate vertices and near-collinear
+             edges, i.e. the degenerate input the rounding code has to clamp
+
+Each vertex gets a rounding drawn from the preset styles, so every polygon mixes
+sharp, round and smoothed corners.
+"""
+
+import math
+import random
+from typing import Callable, Dict, List, Tuple
+
+from geometry.corner_rounding import CornerRounding
+from geometry.rounded_polygon import RoundedPolygon
+from shapes.shape_presets import ROUND, SHARP, SMOOTH, SOFT, VALLEY
+
+UnitData = List[Tuple[Tuple[float, float], CornerRounding]]
+
+ROUNDINGS = (SHARP, SOFT, ROUND, SMOOTH, VALLEY)
+
+MIN_VERTICES = 5
+
+
+def _rounding(rng: random.Random) -> CornerRounding:
+    return rng.choice(ROUNDINGS)
+
+
+def star(n: int, rng: random.Random) -> UnitData:
+    # jittered but strictly increasing angles keep the outline simple
+    step = 2 * math.pi / n
+    data = []
+    for i in range(n):
+        angle = (i + rng.uniform(0.1, 0.9)) * step
+        radius = rng.uniform(0.2, 0.45)
+        data.append(
+            ((0.5 + radius * math.cos(angle), 0.5 + radius * math.sin(angle)), _rounding(rng))
+        )
+    return data
+
+
+def comb(n: int, rng: random.Random) -> UnitData:
+    teeth = n - 2
+    data = []
+    for i in range(teeth):
+        x = 0.1 + 0.8 * i / (teeth - 1)
+        # tips and valleys alternate; the valleys are the concave corners
+        y = rng.uniform(0.08, 0.15) if i % 2 == 0 else rng.uniform(0.5, 0.6)
+        data.append(((x, y), _rounding(rng)))
+    data.append(((0.9, 0.9), _rounding(rng)))
+    data.append(((0.1, 0.9), _rounding(rng)))
+    return data
+
+
+def jagged(n: int, rng: random.Random) -> UnitData:
+    data = []
+    step = 2 * math.pi / n
+    for i in range(n):
+        kind = i % 3
+        angle = i * step
+        if kind == 1:
+            # almost on top of the previous vertex
+            angle = (i - 1) * step + step * 1e-4
+        radius = 0.4 if kind != 2 else 0.4 * math.cos(step / 2) + 1e-6  # near-collinear
+        data.append(
+            ((0.5 + radius * math.cos(angle), 0.5 + radius * math.sin(angle)), _rounding(rng))
+        )
+    return data
+
+
+GENERATORS: Dict[str, Callable[[int, random.Random], UnitData]] = {
+    "star": star,
+    "comb": comb,
+    "jagged": jagged,
+}
+
+
+def unit_data(kind: str, n: int, seed: int = 0) -> UnitData:
+    """`n` vertices of the given generator; the same seed gives the same shape."""
+    if n < MIN_VERTICES:
+        raise ValueError(f"synthetic polygons need at least {MIN_VERTICES} vertices")
+    return GENERATORS[kind](n, random.Random(f"{kind}:{n}:{seed}"))
+
+
+def polygon(kind: str, n: int, seed: int = 0, size=500, margin=50) -> RoundedPolygon:
+    return RoundedPolygon.from_unit_data(unit_data(kind, n, seed), size, margin)
@@ -0,0 +1,52 @@
+"""
+Time to pre-match preset transitions with morph.cache.warm_up.
+
+Runs the warm-up for the AnimateShapeMorph preset cycle (or all preset pairs
+with --all-pairs) at each worker count and reports the wall time, along with
+the serial time for comparison.
+
+Usage (from the repository root):
+    python -m benchmarks.warm_up [--workers 1 2 4 8] [--all-pairs]
+"""
+
+import argparse
+import os
+import time
+
+from morph.cache import MorphCache, all_transitions, cycle_transitions, warm_up
+from benchmarks.common import load_presets, preset_polygon
+from benchmarks.canonical_quality import ANIMATION_CYCLE
+
+
+def run(worker_counts, all_pairs: bool) -> None:
+    presets = load_presets()
+    names = list(presets) if all_pairs else ANIMATION_CYCLE
+    polygons = [preset_polygon(presets[n]) for n in names]
+    transitions = all_transitions(polygons) if all_pairs else cycle_transitions(polygons)
+
+    cache = MorphCache()
+    start = time.perf_counter()
+    for poly1, poly2 in transitions:
+        cache.get_or_match(poly1, poly2)
+    serial = time.perf_counter() - start
+
+    print(f"transitions: {len(transitions)}, cpus: {os.cpu_count()}")
+    print(f"{'workers':>7} | {'wall ms':>9} | {'speedup':>7}")
+    print("-" * 30)
+    print(f"{'serial':>7} | {serial * 1000:>9.1f} | {1.0:>7.2f}")
+
+    for workers in worker_counts:
+        cache = MorphCache()
+        start = time.perf_counter()
+        warm_up(cache, transitions, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>7} | {elapsed * 1000:>9.1f} | {serial / elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--all-pairs", action="store_true")
+    args = parser.parse_args()
+
+    run(args.workers, args.all_pairs)
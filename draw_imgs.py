@@ -24,15 +24,7 @@ OUTPUT_DIR = BASE_DIR / "outputs"
 
 
 def draw_material_shape(unit_data, filename="shape.png", size=1000, margin=0):
-    draw_area = size - (margin * 2)
-
-    verts = []
-    per_vertex = []
-    for (ux, uy), rounding_preset in unit_data:
-        sx = margin + (ux * draw_area)
-        sy = margin + (uy * draw_area)
-        verts.extend([sx, sy])
-        per_vertex.append(rounding_preset)
+    verts, per_vertex = RoundedPolygon.unit_vertices(unit_data, size, margin)
 
     surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
     ctx = cairo.Context(surface)
@@ -1,5 +1,6 @@
 import math
 from dataclasses import dataclass
+from typing import List, Sequence
 
 
 @dataclass
@@ -60,6 +61,26 @@ class Cubic:
     def reverse(self) -> "Cubic":
         return Cubic(p0=self.p3, p1=self.p2, p2=self.p1, p3=self.p0)
 
+    @staticmethod
+    def to_coords(cubics: List["Cubic"]) -> List[float]:
+        """Flattens cubics to [p0.x, p0.y, p1.x, p1.y, p2.x, p2.y, p3.x, p3.y, ...]."""
+        return [
+            v for c in cubics for p in (c.p0, c.p1, c.p2, c.p3) for v in (p.x, p.y)
+        ]
+
+    @staticmethod
+    def from_coords(v: Sequence[float]) -> List["Cubic"]:
+        """Inverse of to_coords."""
+        return [
+            Cubic(
+                Point(v[i], v[i + 1]),
+                Point(v[i + 2], v[i + 3]),
+                Point(v[i + 4], v[i + 5]),
+                Point(v[i + 6], v[i + 7]),
+            )
+            for i in range(0, len(v), 8)
+        ]
+
     @staticmethod
     def straight_line(x0, y0, x1, y1):
         p0 = Point(x0, y0)
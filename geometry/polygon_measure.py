@@ -1,5 +1,6 @@
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 from .bezier_geometry import Cubic
 from .rounded_polygon import Feature, RoundedPolygon
@@ -113,6 +114,9 @@ class DoubleMapper:
 
     map(x):      Shape 1 progress -> Shape 2 progress
     map_back(x): Shape 2 progress -> Shape 1 progress
+
+    Segment lookup is a bisect over the sorted anchors, map_many/map_back_many
+    apply the mapping to a whole batch of progress values at once.
     """
 
     def __init__(self, *mappings):
@@ -122,16 +126,64 @@ class DoubleMapper:
         self._validate_progress(self.source)
         self._validate_progress(self.target)
 
+        # validated lists are circularly sorted, so segments can be found by bisect
+        self._source_lookup = self._segment_lookup(self.source)
+        self._target_lookup = self._segment_lookup(self.target)
+
     def map(self, x: float) -> float:
         """Maps a progress value from Shape 1's space to Shape 2's space."""
-        return self._linear_map(self.source, self.target, x)
+        return self._linear_map(self.source, self.target, self._source_lookup, x)
 
     def map_back(self, x: float) -> float:
         """Maps a progress value from Shape 2's space back to Shape 1's space."""
-        return self._linear_map(self.target, self.source, x)
+        return self._linear_map(self.target, self.source, self._target_lookup, x)
+
+    def map_many(self, xs: Iterable[float]) -> List[float]:
+        """map() over a batch of progress values in a single pass."""
+        source, target, lookup = self.source, self.target, self._source_lookup
+        return [self._linear_map(source, target, lookup, x) for x in xs]
+
+    def map_back_many(self, xs: Iterable[float]) -> List[float]:
+        """map_back() over a batch of progress values in a single pass."""
+        target, source, lookup = self.target, self.source, self._target_lookup
+        return [self._linear_map(target, source, lookup, x) for x in xs]
+
+    @staticmethod
+    def _segment_lookup(x_values: list[float]) -> Tuple[list[float], list[int]]:
+        """Anchor values in ascending order, with their index in x_values."""
+        order = sorted(range(len(x_values)), key=x_values.__getitem__)
+        return [x_values[i] for i in order], order
+
+    @staticmethod
+    def _find_segment(
+        x_values: list[float], lookup: Tuple[list[float], list[int]], x: float
+    ) -> int:
+        """
+        Index of the first segment [x_values[i], x_values[i + 1]] (circular,
+        inclusive) containing x.
+
+        x on an anchor lies in two segments; the lower index wins, which is
+        the anchor's own segment for index 0 and the previous one otherwise.
+        """
+        sorted_values, order = lookup
+        j = bisect_right(sorted_values, x)
+
+        if j > 0 and sorted_values[j - 1] == x:
+            anchor_index = order[j - 1]
+            return 0 if anchor_index == 0 else anchor_index - 1
+
+        # before the smallest or after the largest anchor -> wrapping segment
+        if j == 0 or j == len(x_values):
+            return order[-1]
+
+        return order[j - 1]
 
     def _linear_map(
-        self, x_values: list[float], y_values: list[float], x: float
+        self,
+        x_values: list[float],
+        y_values: list[float],
+        lookup: Tuple[list[float], list[int]],
+        x: float,
     ) -> float:
         """
         Piecewise-linear interpolation on a circular [0, 1) domain.
@@ -145,15 +197,7 @@ class DoubleMapper:
         n = len(x_values)
 
         # find segment where x lies
-        segment_start_index = None
-        for i in range(n):
-            if progress_in_range(x, x_values[i], x_values[(i + 1) % n]):
-                segment_start_index = i
-                break
-
-        if segment_start_index is None:
-            raise ValueError("No valid segment found for x")
-
+        segment_start_index = self._find_segment(x_values, lookup, x)
         segment_end_index = (segment_start_index + 1) % n
 
         # circular segment sizes
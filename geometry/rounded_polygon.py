@@ -1,8 +1,8 @@
 import math
-from pprint import pprint
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+from . import tracing
 from .bezier_geometry import Point, Cubic
 from .corner_rounding import CornerRounding, RoundedCorner
 
@@ -67,10 +67,18 @@ class RoundedPolygon:
             )
             rounded_corners.append(corner)
 
-        print("--- rounded corners ---")
-        for i in rounded_corners:
-            pprint([i.p0, i.p1, i.p2, i.rounding])
-        print()
+        if tracing.debug_on:
+            tracing.emit(
+                "polygon.rounded_corners",
+                corners=[
+                    {
+                        "vertex": [c.p1.x, c.p1.y],
+                        "radius": c.rounding.radius,
+                        "smoothing": c.rounding.smoothing,
+                    }
+                    for c in rounded_corners
+                ],
+            )
 
         # --- Resolve overlapping cuts (tight-space adjustment) ---
         # For each edge, check whether the two flanking corners claim more
@@ -107,9 +115,9 @@ class RoundedPolygon:
             else:
                 cut_adjusts.append((1.0, 1.0))
 
-        print("----- cut adjusts -----")
-        pprint(cut_adjusts)
-        print()
+        if tracing.debug_on:
+            # (round_ratio, smooth_ratio) per edge
+            tracing.emit("polygon.cut_adjusts", ratios=cut_adjusts)
 
         # --- Generate Final Features ---
         # Generate a corner feature paired with a straight edge on each vertex
@@ -173,15 +181,50 @@ class RoundedPolygon:
             )
             features.append(Feature(curves=[edge_line], type="edge"))
 
-        print("----features-----")
-        pprint(features)
-        print()
+        if tracing.debug_on:
+            tracing.emit(
+                "polygon.features",
+                features=[
+                    {"type": f.type, "convex": f.is_convex, "cubics": len(f.curves)}
+                    for f in features
+                ],
+            )
 
         if center_x is None or center_y is None:
             center_x, center_y = cls._calculate_center(vertices)
 
         return cls(features, center_x, center_y)
 
+    @staticmethod
+    def unit_vertices(
+        unit_data: List[Tuple[Tuple[float, float], CornerRounding]],
+        size: float = 500,
+        margin: float = 0,
+    ) -> Tuple[List[float], List[CornerRounding]]:
+        """
+        Maps preset vertices ((ux, uy), rounding) from the unit square onto the
+        square [margin, size - margin]. Returns the flat vertex list and the
+        per-vertex roundings, as RoundedPolygon.create takes them.
+        """
+        draw_area = size - (margin * 2)
+        verts = []
+        per_vertex = []
+        for (ux, uy), rounding_preset in unit_data:
+            verts.extend([margin + (ux * draw_area), margin + (uy * draw_area)])
+            per_vertex.append(rounding_preset)
+        return verts, per_vertex
+
+    @classmethod
+    def from_unit_data(
+        cls,
+        unit_data: List[Tuple[Tuple[float, float], CornerRounding]],
+        size: float = 500,
+        margin: float = 0,
+    ) -> "RoundedPolygon":
+        """A preset (see shapes/shape_presets.py) placed in a size x size area."""
+        verts, per_vertex = cls.unit_vertices(unit_data, size, margin)
+        return cls.create(vertices=verts, per_vertex_rounding=per_vertex)
+
     @staticmethod
     def _is_clockwise(vertices: List[float]) -> bool:
         # uses Shoelace formula
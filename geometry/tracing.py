@@ -0,0 +1,108 @@
+"""
+Structured debug tracing for the geometry and morph code.
+
+Trace points are guarded by module-level level flags, so disabled tracing
+costs one attribute check and nothing is formatted or measured:
+
+    from geometry import tracing
+
+    if tracing.debug_on:
+        tracing.emit("morph.alignment", cut_point=poly2_cut_point)
+
+Hot loops read the flag once into a local before the loop.
+
+Enabled trace points emit TraceRecords (event name, level, fields) to the
+current sink. The default sink writes one JSON object per line to stderr.
+The level is taken from the CAIRO_SHAPES_TRACE environment variable
+("off", "warning", "info" or "debug"; default "warning") when this module is
+first imported, and can be changed later with set_level.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List
+
+OFF = 0
+WARNING = 1
+INFO = 2
+DEBUG = 3
+
+_LEVEL_NAMES = {"off": OFF, "warning": WARNING, "info": INFO, "debug": DEBUG}
+
+
+@dataclass
+class TraceRecord:
+    event: str
+    level: int
+    fields: Dict[str, Any]
+    time: float  # time.perf_counter() when emitted
+
+    def to_dict(self) -> Dict[str, Any]:
+        name = next(k for k, v in _LEVEL_NAMES.items() if v == self.level)
+        return {"event": self.event, "level": name, "time": self.time, **self.fields}
+
+
+def stderr_sink(record: TraceRecord):
+    sys.stderr.write(json.dumps(record.to_dict(), default=repr) + "\n")
+
+
+# flags checked at trace points, kept in sync by set_level
+warnings_on = True
+info_on = False
+debug_on = False
+
+_level = WARNING
+_sink: Callable[[TraceRecord], None] = stderr_sink
+
+
+def set_level(level: int):
+    global _level, warnings_on, info_on, debug_on
+    _level = level
+    warnings_on = level >= WARNING
+    info_on = level >= INFO
+    debug_on = level >= DEBUG
+
+
+def get_level() -> int:
+    return _level
+
+
+def set_sink(sink: Callable[[TraceRecord], None]) -> Callable[[TraceRecord], None]:
+    """Replaces the sink and returns the previous one."""
+    global _sink
+    previous = _sink
+    _sink = sink
+    return previous
+
+
+def emit(event: str, level: int = DEBUG, **fields):
+    """Sends a record to the sink if `level` is enabled. Guard calls with the flags."""
+    if level <= _level:
+        _sink(TraceRecord(event, level, fields, time.perf_counter()))
+
+
+def warning(event: str, **fields):
+    emit(event, WARNING, **fields)
+
+
+@contextlib.contextmanager
+def capture(level: int = DEBUG) -> Iterator[List[TraceRecord]]:
+    """Collects the records emitted inside the block, at `level`, into a list."""
+    records: List[TraceRecord] = []
+    previous_level = _level
+    previous_sink = set_sink(records.append)
+    set_level(level)
+    try:
+        yield records
+    finally:
+        set_level(previous_level)
+        set_sink(previous_sink)
+
+
+set_level(
+    _LEVEL_NAMES.get(os.environ.get("CAIRO_SHAPES_TRACE", "warning").lower(), WARNING)
+)
@@ -1,15 +1,27 @@
-from pprint import pprint
-from typing import List, Tuple
-from bisect import bisect_left
+import time
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from bisect import bisect_left, bisect_right
+from heapq import heapify, heappop, heappush
+from itertools import accumulate
 from dataclasses import dataclass
+from concurrent.futures import CancelledError, Executor, Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
+from . import stats as match_stats
 from .debugger import MorphDebugger
+from .stats import MatchStats
+from geometry import tracing
 from geometry.bezier_geometry import Cubic, Point
 from geometry.rounded_polygon import RoundedPolygon, Feature
 from geometry.polygon_measure import (
     AngleEpsilon,
     DistanceEpsilon,
     DoubleMapper,
+    LengthMeasurer,
+    MeasuredCubic,
     MeasuredFeature,
     MeasuredPolygon,
     measure_features,
@@ -22,6 +34,126 @@ from geometry.polygon_measure import (
 _IdentityMapping = [(0.0, 0.0), (0.5, 0.5)]
 
 
+# Below this length ratio a half is treated as a sliver instead of inverting the split
+_MERGE_MIN_RATIO = 1e-3
+
+# Estimated cost of the coarse map_curves fallback per input cubic, updated
+# from every fallback computed; budgeted matches stop waiting early enough for it
+_coarse_seconds_per_cubic = 2e-6
+# Fewest cubics per shape in a decimated fallback, see Morph._coarse_pairs
+_COARSE_MIN_CUBICS = 32
+
+
+class _Refiner:
+    """
+    Runs the exact matches of Morph.match(budget_ms=...) on one daemon thread,
+    so a refinement still pending never holds up interpreter exit.
+
+    Jobs have a key, and only the newest job per key is wanted: submitting a new
+    one cancels the job still queued under that key, and is_latest turns false
+    for one already running so its result isn't delivered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._queue: "OrderedDict[Hashable, Tuple[Future, Callable, tuple]]" = (
+            OrderedDict()
+        )
+        self._latest: Dict[Hashable, Future] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, key: Hashable, fn: Callable, *args) -> Future:
+        future = Future()
+        with self._lock:
+            stale = self._queue.pop(key, None)
+            if stale is not None:
+                stale[0].cancel()
+            self._queue[key] = (future, fn, args)
+            self._latest[key] = future
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="morph-refine", daemon=True
+                )
+                self._thread.start()
+            self._ready.notify()
+        return future
+
+    def is_latest(self, key: Hashable, future: Future) -> bool:
+        with self._lock:
+            return self._latest.get(key) is future
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._ready.wait()
+                key, (future, fn, args) = self._queue.popitem(last=False)
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self._lock:
+                if self._latest.get(key) is future:
+                    del self._latest[key]
+
+
+_refiner = _Refiner()
+
+
+# Representative point and convexity (None unless a corner) of a feature, the
+# only parts of it the distance matrix looks at
+FeatureKey = Tuple[float, float, Optional[bool]]
+
+# Rows of the distance matrix per executor job, aimed at ~16k distances each
+_DISTANCES_PER_JOB = 16384
+
+
+def _distance_rows(keys1: List[FeatureKey], keys2: List[FeatureKey]) -> array:
+    """
+    Squared distances between the features of keys1 (rows) and keys2 (columns),
+    row-major, inf where a convex corner would meet a concave one. Same values
+    as Morph.feature_dist_squared. Module-level so process pools can pickle it.
+    """
+    inf = float("inf")
+    out = array("d")
+    for x1, y1, convex1 in keys1:
+        for x2, y2, convex2 in keys2:
+            if convex1 is not None and convex2 is not None and convex1 != convex2:
+                out.append(inf)
+            else:
+                dx = x1 - x2
+                dy = y1 - y2
+                out.append(dx * dx + dy * dy)
+    return out
+
+
+# (cubic index, Shape 1 progress of its first walk step, cut per step or None)
+WalkChain = Tuple[int, float, List[Optional[float]]]
+
+
+def _cut_chains(
+    chains: List[Tuple[MeasuredCubic, List[Optional[float]]]],
+) -> List[Cubic]:
+    """
+    Replays planned walk chains: each cubic is cut at its listed progress values in
+    turn, emitting the front piece per cut and the remainder on None.
+    Module-level so process pools can pickle it.
+    """
+    segments = []
+    for measured, cuts in chains:
+        for cut in cuts:
+            if cut is None:
+                segments.append(measured.cubic)
+            else:
+                seg, measured = measured.cut_at_progress(cut)
+                segments.append(seg.cubic)
+    return segments
+
+
 @dataclass
 class DistanceVertex:
     distance: float
@@ -29,32 +161,135 @@ class DistanceVertex:
     f2: MeasuredFeature
 
 
+@dataclass(frozen=True)
+class MatchPlan:
+    """
+    The topology-dependent part of a Morph.match, reusable via Morph.rematch.
+
+    anchors are the matched (corner index in shape 1, corner index in shape 2)
+    pairs. Cut points and walk decisions depend on measured progress, so they
+    are recomputed, but they are the cheap part of a match.
+    """
+
+    anchors: Tuple[Tuple[int, int], ...]
+    topology1: Tuple[bool, ...]  # convexity of each corner of shape 1
+    topology2: Tuple[bool, ...]
+
+    @staticmethod
+    def topology(corners: List[MeasuredFeature]) -> Tuple[bool, ...]:
+        return tuple(c.feature.is_convex for c in corners)
+
+    def fits(
+        self, corners1: List[MeasuredFeature], corners2: List[MeasuredFeature]
+    ) -> bool:
+        return (
+            MatchPlan.topology(corners1) == self.topology1
+            and MatchPlan.topology(corners2) == self.topology2
+        )
+
+    def swapped(self) -> "MatchPlan":
+        """The same anchors for matching shape 2 onto shape 1."""
+        return MatchPlan(
+            tuple(sorted((j, i) for i, j in self.anchors)),
+            self.topology2,
+            self.topology1,
+        )
+
+
+class MatchedPairs(list):
+    """
+    The (Cubic, Cubic) pairs returned by Morph.match. A plain list otherwise,
+    it also keeps the MatchPlan it was built from (None for coarse results).
+    """
+
+    def __init__(self, pairs=(), plan: Optional[MatchPlan] = None):
+        super().__init__(pairs)
+        self.plan = plan
+
+    def reversed(self) -> "ReversedPairs":
+        """Lazy B -> A view of these pairs, see ReversedPairs."""
+        return ReversedPairs(self)
+
+
+class ReversedPairs(Sequence):
+    """
+    Lazy view of matched pairs with the roles swapped: item i is (c2, c1) of the
+    underlying pair, computed on access. Nothing is copied or re-matched.
+
+    Geometry: Morph.as_cubics(view, t) traces the same shape as
+    Morph.as_cubics(pairs, 1 - t), up to float rounding in the lerp. It is NOT
+    generally the same as match(B, A), for two reasons:
+      - the outline starts at the point of B that corresponds to A's start,
+        while match(B, A) starts at B's own progress 0.0 and cuts A instead,
+        so the pair boundaries differ;
+      - the greedy anchor mapping is not symmetric: candidates are inserted by
+        shape-1 progress and crowding/crossing rejections depend on which
+        anchors were accepted first, so B -> A can pick different corners.
+    Both shapes are traced exactly either way (pairs only subdivide). For a
+    real B -> A match with the same anchors, use
+    Morph.rematch(view.plan, poly_b, poly_a).
+    """
+
+    def __init__(self, pairs: Sequence[Tuple[Cubic, Cubic]]):
+        self._pairs = pairs
+
+    @property
+    def plan(self) -> Optional[MatchPlan]:
+        plan = getattr(self._pairs, "plan", None)
+        return plan.swapped() if plan is not None else None
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [(c2, c1) for c1, c2 in self._pairs[index]]
+        c1, c2 = self._pairs[index]
+        return (c2, c1)
+
+    def __iter__(self):
+        for c1, c2 in self._pairs:
+            yield (c2, c1)
+
+    def reversed(self) -> Sequence[Tuple[Cubic, Cubic]]:
+        """The original, un-swapped pairs."""
+        return self._pairs
+
+
 class Morph:
     @staticmethod
     def balance_segments(curves: List[Cubic], target_count: int) -> List[Cubic]:
-        result = curves
-
-        if not result:
-            result = list(curves)
-
-        print("splitting, length and target:", len(result), target_count)
-        pprint(result)
-
-        # repeatedly find the longest cubic and split
-        while len(result) < target_count:
-            idx_to_split = 0
-            max_score = -1.0
-            for i, c in enumerate(result):
-                score = c.p0.dist_to(c.p1) + c.p1.dist_to(c.p2) + c.p2.dist_to(c.p3)
-                if score > max_score:
-                    max_score = score
-                    idx_to_split = i
-                    print("==splitting index : ", idx_to_split, score)
-
-            c1, c2 = result[idx_to_split].split(0.5)
-            result[idx_to_split] = c1
-            result.insert(idx_to_split + 1, c2)
-        return result
+        """
+        Splits cubics in half until there are target_count of them, always taking
+        the one with the longest control polygon (first in order on ties).
+
+        Cubics sit in a max-heap keyed by that length. Each carries its position
+        as a tuple path (original index, then 0/1 per split half), which breaks
+        ties like a left-to-right scan would and orders the final list.
+        """
+        if tracing.debug_on:
+            tracing.emit(
+                "morph.balance_segments", count=len(curves), target=target_count
+            )
+
+        heap = [
+            (-Morph._control_polygon_length(c), (i,), c) for i, c in enumerate(curves)
+        ]
+        heapify(heap)
+
+        # repeatedly split the longest cubic, pushing both halves back
+        for _ in range(target_count - len(heap)):
+            _, position, cubic = heappop(heap)
+            c1, c2 = cubic.split(0.5)
+            heappush(heap, (-Morph._control_polygon_length(c1), position + (0,), c1))
+            heappush(heap, (-Morph._control_polygon_length(c2), position + (1,), c2))
+
+        heap.sort(key=lambda entry: entry[1])
+        return [entry[2] for entry in heap]
+
+    @staticmethod
+    def _control_polygon_length(c: Cubic) -> float:
+        return c.p0.dist_to(c.p1) + c.p1.dist_to(c.p2) + c.p2.dist_to(c.p3)
 
     @staticmethod
     def map_curves(
@@ -63,23 +298,26 @@ class Morph:
         curves_a = poly_start.get_all_curves()
         curves_b = poly_end.get_all_curves()
 
-        target_count = max(len(curves_a), len(curves_b))
-        print(
-            " -- getting target count -- ", target_count, len(curves_a), len(curves_b)
-        )
-
         # filter out degenerate cubics
         result_a = [c for c in curves_a if c.p0.dist_to(c.p3) > 0.001]
         result_b = [c for c in curves_b if c.p0.dist_to(c.p3) > 0.001]
 
-        target_count = max(len(result_a), len(result_b))
+        if tracing.debug_on:
+            tracing.emit(
+                "morph.map_curves",
+                cubics=[len(curves_a), len(curves_b)],
+                filtered=[len(result_a), len(result_b)],
+                target=max(len(result_a), len(result_b)),
+            )
 
-        print(
-            " -- getting filtered target count -- ",
-            target_count,
-            len(result_a),
-            len(result_b),
-        )
+        return Morph._pair_curves(result_a, result_b)
+
+    @staticmethod
+    def _pair_curves(
+        result_a: List[Cubic], result_b: List[Cubic]
+    ) -> Tuple[List[Cubic], List[Cubic]]:
+        """Balances both lists to the same length and aligns their start points."""
+        target_count = max(len(result_a), len(result_b))
 
         balanced_a = Morph.balance_segments(result_a, target_count)
         balanced_b = Morph.balance_segments(result_b, target_count)
@@ -117,31 +355,26 @@ class Morph:
         _, feats_a = measure_features(poly_start.features)
         _, feats_b = measure_features(poly_end.features)
 
-        print("all feats : ", len(poly_start.features))
         corners_a: List[MeasuredFeature] = [
             c for c in feats_a if c.feature.type == "corner"
         ]
         corners_b: List[MeasuredFeature] = [
             c for c in feats_b if c.feature.type == "corner"
         ]
-        print("all corners : ", len(corners_a))
 
         feature_progress_mapping = Morph.do_mapping(corners_a, corners_b)
-
-        print(
-            " | ".join(
-                f"{src:.4f} -> {dst:.4f}" for src, dst in feature_progress_mapping
-            )
-        )
-
         dm = DoubleMapper(*feature_progress_mapping)
 
-        N = 10
-        map_values = [f"{dm.map(i / N):.4f}" for i in range(N + 1)]
-        map_back_values = [f"{dm.map_back(i / N):.4f}" for i in range(N + 1)]
-
-        print("Map :", " | ".join(map_values))
-        print("Mb  :", " | ".join(map_back_values))
+        if tracing.debug_on:
+            N = 10
+            tracing.emit(
+                "morph.map_features",
+                features=len(poly_start.features),
+                corners=[len(corners_a), len(corners_b)],
+                mapping=feature_progress_mapping,
+                map=[dm.map(i / N) for i in range(N + 1)],
+                map_back=[dm.map_back(i / N) for i in range(N + 1)],
+            )
 
         return dm
 
@@ -154,37 +387,124 @@ class Morph:
         Builds a list of (progress1, progress2) anchor pairs by greedily matching
         corner features from both shapes based on spatial proximity.
         """
+        anchors = Morph.map_corner_indices(features1, features2)
+        return Morph.anchor_progress_pairs(features1, features2, anchors)
+
+    @staticmethod
+    def map_corner_indices(
+        features1: List[MeasuredFeature],
+        features2: List[MeasuredFeature],
+        stats: Optional[MatchStats] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        The matching behind do_mapping, as (index in features1, index in features2)
+        pairs ordered by progress1. Indices stay valid when the geometry changes
+        but the corner topology doesn't, which is what MatchPlan relies on.
 
-        MorphDebugger.print_distance_matrix(features1, features2)
+        With an executor, the rows of the distance matrix are computed on it in
+        blocks. The distances, and so the mapping, are the same either way.
+        """
+        if stats is not None:
+            start = time.perf_counter()
 
-        distance_vertex_list: List[DistanceVertex] = []
+        if tracing.debug_on:
+            MorphDebugger.trace_distance_matrix(features1, features2)
 
-        for f1 in features1:
-            for f2 in features2:
-                d = Morph.feature_dist_squared(f1, f2)
-                if d != float("inf"):
-                    distance_vertex_list.append(DistanceVertex(d, f1, f2))
+        distances = Morph._distance_matrix(features1, features2, executor)
 
-        # sort by distance
-        distance_vertex_list = sorted(distance_vertex_list, key=lambda x: x.distance)
+        # candidate pairs as flat row-major indices, nearest first; the sort is
+        # stable, so ties keep the features1-major order. Incompatible pairs are
+        # inf and sort last, where they are dropped.
+        n2 = len(features2)
+        order = sorted(range(len(distances)), key=distances.__getitem__)
+        del order[len(distances) - distances.count(float("inf")) :]
 
-        if not distance_vertex_list:
-            return list(_IdentityMapping)
+        if stats is not None:
+            start = stats.record("distance_matrix", start)
 
-        # only one valid pair => adds an antipodal point
-        if len(distance_vertex_list) == 1:
-            dv = distance_vertex_list[0]
-            f1_prog = dv.f1.progress
-            f2_prog = dv.f2.progress
-            return [(f1_prog, f2_prog), ((f1_prog + 0.5) % 1.0, (f2_prog + 0.5) % 1.0)]
+        if not order:
+            return []
+
+        # only one valid pair, anchor_progress_pairs adds the antipodal point
+        if len(order) == 1:
+            if stats is not None:
+                stats.anchors = 1
+                stats.record("mapping", start)
+            return [divmod(order[0], n2)]
 
         helper = MappingHelper()
-        for f in distance_vertex_list:
-            helper.add_mapping(f.f1, f.f2)
+        rejected = 0
+        for k in order:
+            i, j = divmod(k, n2)
+            if not helper.add_mapping(features1[i], features2[j]):
+                rejected += 1
+
+        if stats is not None:
+            stats.anchors = len(helper.features)
+            stats.rejected_mappings = rejected
+            stats.record("mapping", start)
+
+        if tracing.debug_on:
+            MorphDebugger.trace_mapping_decisions(
+                [
+                    DistanceVertex(distances[k], features1[k // n2], features2[k % n2])
+                    for k in order
+                ],
+                helper.mapping,
+            )
 
-        MorphDebugger.print_mapping_decisions(distance_vertex_list, helper.mapping)
+        index1 = {id(f): i for i, f in enumerate(features1)}
+        index2 = {id(f): i for i, f in enumerate(features2)}
+        return [(index1[id(f1)], index2[id(f2)]) for f1, f2 in helper.features]
 
-        return helper.mapping
+    @staticmethod
+    def _distance_matrix(
+        features1: List[MeasuredFeature],
+        features2: List[MeasuredFeature],
+        executor: Optional[Executor],
+    ) -> array:
+        """Row-major feature_dist_squared of every pair, see _distance_rows."""
+        keys1 = [Morph._feature_key(f) for f in features1]
+        keys2 = [Morph._feature_key(f) for f in features2]
+        if executor is None or not keys2:
+            return _distance_rows(keys1, keys2)
+
+        rows_per_job = max(1, _DISTANCES_PER_JOB // len(keys2))
+        futures = [
+            executor.submit(_distance_rows, keys1[i : i + rows_per_job], keys2)
+            for i in range(0, len(keys1), rows_per_job)
+        ]
+        distances = array("d")
+        for future in futures:
+            distances.extend(future.result())
+        return distances
+
+    @staticmethod
+    def _feature_key(f: MeasuredFeature) -> FeatureKey:
+        point = Morph.feature_representative_point(f.feature)
+        convex = f.feature.is_convex if f.feature.type == "corner" else None
+        return (point.x, point.y, convex)
+
+    @staticmethod
+    def anchor_progress_pairs(
+        features1: List[MeasuredFeature],
+        features2: List[MeasuredFeature],
+        anchors: List[Tuple[int, int]],
+    ) -> List[Tuple[float, float]]:
+        """
+        (progress1, progress2) pairs for DoubleMapper from feature index pairs.
+        No anchors gives the identity mapping, a single one gets an antipodal
+        partner so the mapping stays well defined.
+        """
+        if not anchors:
+            return list(_IdentityMapping)
+
+        pairs = [(features1[i].progress, features2[j].progress) for i, j in anchors]
+        if len(pairs) == 1:
+            f1_prog, f2_prog = pairs[0]
+            pairs.append(((f1_prog + 0.5) % 1.0, (f2_prog + 0.5) % 1.0))
+        return pairs
 
     @staticmethod
     def feature_dist_squared(f1: MeasuredFeature, f2: MeasuredFeature) -> float:
@@ -208,108 +528,423 @@ class Morph:
 
     @staticmethod
     def match(
-        poly1: RoundedPolygon, poly2: RoundedPolygon
-    ) -> List[Tuple[Cubic, Cubic]]:
-        MorphDebugger.inspect_all(poly1, poly2)
+        poly1: RoundedPolygon,
+        poly2: RoundedPolygon,
+        executor: Optional[Executor] = None,
+        budget_ms: Optional[float] = None,
+        on_refined: Optional[Callable[[List[Tuple[Cubic, Cubic]]], None]] = None,
+        stats: Optional[MatchStats] = None,
+    ) -> MatchedPairs:
+        """
+        Matches the cubics of both polygons into (Cubic, Cubic) pairs, see README.
+        The returned list also carries the MatchPlan it was built from, see rematch.
+
+        If `stats` is given, the wall time of each phase and the work counters are
+        recorded into it (see morph/stats.py). A hook installed with
+        stats.set_stats_hook gets one for every match.
+
+        If `executor` is given, the rows of the corner distance matrix (the bulk
+        of a large match) and the cutting part of the walk run on it. Only a
+        ProcessPoolExecutor on a multi-core machine runs them in parallel; the
+        output is identical either way. See README for when it pays off.
+
+        If `budget_ms` is given, the exact match runs in the background and is
+        returned only if it finishes within the budget (less the estimated cost of
+        the fallback). Otherwise the coarse `map_curves` pairing is returned, and
+        the exact pairs are passed to `on_refined` once ready. The callback runs on
+        the worker thread, so GTK callers should hop back with GLib.idle_add.
+        A newer budgeted match with the same `on_refined` supersedes an older one
+        still refining: the older result is never delivered. Without `on_refined`
+        the refinement is dropped when the budget runs out. If the exact match
+        fails, in or after the budget, the coarse pairs stand and the error is
+        reported as a "morph.refine_failed" trace warning.
+        """
+        if budget_ms is not None:
+            return Morph._match_within_budget(
+                poly1, poly2, budget_ms, on_refined, executor
+            )
+
+        if tracing.debug_on:
+            MorphDebugger.inspect_all(poly1, poly2)
+
+        hook = match_stats.stats_hook
+        if stats is None and hook is not None:
+            stats = MatchStats()
+        if stats is not None:
+            start = time.perf_counter()
 
         measured1: MeasuredPolygon = MeasuredPolygon.measure_polygon(poly1)
         measured2: MeasuredPolygon = MeasuredPolygon.measure_polygon(poly2)
 
-        corners1 = []
-        for i, f in enumerate(measured1.features):
-            if f.feature.type == "corner":
-                f.index = i  # for debugging
-                corners1.append(f)
+        corners1 = Morph._indexed_corners(measured1)
+        corners2 = Morph._indexed_corners(measured2)
+
+        if stats is not None:
+            stats.cubics_measured = len(measured1) + len(measured2)
+            stats.record("measure", start)
 
-        corners2 = []
-        for i, f in enumerate(measured2.features):
+        anchors = Morph.map_corner_indices(corners1, corners2, stats, executor)
+        plan = MatchPlan(
+            tuple(anchors),
+            MatchPlan.topology(corners1),
+            MatchPlan.topology(corners2),
+        )
+
+        result = Morph._match_measured(
+            measured1, measured2, corners1, corners2, plan, executor, stats
+        )
+        if hook is not None:
+            hook(stats)
+        return result
+
+    @staticmethod
+    def rematch(
+        plan: Optional[MatchPlan],
+        poly1: RoundedPolygon,
+        poly2: RoundedPolygon,
+        executor: Optional[Executor] = None,
+    ) -> MatchedPairs:
+        """
+        Re-applies the plan of an earlier match to edited versions of its shapes.
+
+        If neither shape's corner topology (count and convexity of corners) has
+        changed, the plan's anchor pairs are reused: only measurement, cutting
+        and the walk are redone, skipping the distance matrix, sorting and greedy
+        mapping. Otherwise, or without a plan, this is a full Morph.match.
+        """
+        if plan is None:
+            return Morph.match(poly1, poly2, executor)
+
+        measured1 = MeasuredPolygon.measure_polygon(poly1)
+        measured2 = MeasuredPolygon.measure_polygon(poly2)
+        corners1 = Morph._indexed_corners(measured1)
+        corners2 = Morph._indexed_corners(measured2)
+
+        if not plan.fits(corners1, corners2):
+            return Morph.match(poly1, poly2, executor)
+
+        try:
+            return Morph._match_measured(
+                measured1, measured2, corners1, corners2, plan, executor
+            )
+        except ValueError:
+            # edited corners crowd each other too closely for the old anchors
+            return Morph.match(poly1, poly2, executor)
+
+    @staticmethod
+    def _indexed_corners(measured: MeasuredPolygon) -> List[MeasuredFeature]:
+        corners = []
+        for i, f in enumerate(measured.features):
             if f.feature.type == "corner":
-                f.index = i
-                corners2.append(f)
+                f.index = i  # for debugging
+                corners.append(f)
+        return corners
 
-        mapping_pairs: List[Tuple[float, float]] = Morph.do_mapping(corners1, corners2)
-        MorphDebugger.print_mapping_results(measured1, measured2, mapping_pairs)
+    @staticmethod
+    def _match_measured(
+        measured1: MeasuredPolygon,
+        measured2: MeasuredPolygon,
+        corners1: List[MeasuredFeature],
+        corners2: List[MeasuredFeature],
+        plan: MatchPlan,
+        executor: Optional[Executor],
+        stats: Optional[MatchStats] = None,
+    ) -> MatchedPairs:
+        if stats is not None:
+            start = time.perf_counter()
+
+        mapping_pairs: List[Tuple[float, float]] = Morph.anchor_progress_pairs(
+            corners1, corners2, plan.anchors
+        )
+        if tracing.debug_on:
+            MorphDebugger.trace_mapping_results(measured1, measured2, mapping_pairs)
 
         double_mapper = DoubleMapper(*mapping_pairs)
 
         # Determine where Shape 2 should "start" to align with Shape 1's 0.0
         poly2_cut_point = double_mapper.map(0.0)
 
-        print("\n[ ALIGNMENT ]")
-        print(f"Shape 2 cut point: {poly2_cut_point:.4f} (mapping of 0.0 on Shape 1)")
+        if stats is not None:
+            start = stats.record("mapping", start)
 
         # Cut and shift Shape 2 so its index 0 aligns with Shape 1's index 0
         bs1: MeasuredPolygon = measured1
         bs2: MeasuredPolygon = measured2.cut_and_shift(poly2_cut_point)
 
-        print(
-            f"After cut_and_shift: bs1 has {len(bs1)} cubics, bs2 has {len(bs2)} cubics"
+        if tracing.debug_on:
+            # cut point is the mapping of 0.0 on Shape 1
+            tracing.emit(
+                "morph.alignment",
+                cut_point=poly2_cut_point,
+                cubics=[len(bs1), len(bs2)],
+            )
+
+        # End progress of every bs2 cubic in Shape 1's space, mapped in one pass:
+        # undo the shift to get original Shape 2 progress, then map_back. Cutting
+        # a cubic never moves its end, so these stay valid for the whole walk.
+        # The last cubic is forced to 1.0 to guarantee both finish together.
+        b2_ends = double_mapper.map_back_many(
+            (bs2[i].end_outline_progress + poly2_cut_point) % 1.0
+            for i in range(bs2.size - 1)
         )
+        b2_ends.append(1.0)
 
-        # Walks both polygons simultaneously, producing matched (Cubic, Cubic) pairs.
-        # Whichever cubic ends sooner is consumed whole; the other is cut at the
-        # corresponding point so their boundaries align.
-        ret = []
-        i1, i2 = 0, 0
-        b1 = bs1.get_cubic(i1)
-        i1 += 1
-        b2 = bs2.get_cubic(i2)
-        i2 += 1
+        if stats is not None:
+            start = stats.record("cut_and_shift", start)
+
+        chains1, chains2 = Morph._plan_walk(
+            bs1, bs2, b2_ends, double_mapper, poly2_cut_point
+        )
+
+        if executor is None:
+            segs1 = _cut_chains([(bs1[i], cuts) for i, _, cuts in chains1])
+            segs2 = _cut_chains([(bs2[i], cuts) for i, _, cuts in chains2])
+        else:
+            segs1, segs2 = Morph._cut_chains_by_span(
+                bs1, bs2, chains1, chains2, double_mapper.source, executor
+            )
+
+        ret = MatchedPairs(zip(segs1, segs2), plan)
+
+        if stats is not None:
+            stats.cuts = sum(
+                cut is not None
+                for _, _, cuts in chains1 + chains2
+                for cut in cuts
+            )
+            stats.pairs = len(ret)
+            stats.record("walk", start)
+
+        if tracing.debug_on:
+            MorphDebugger.trace_final_matched_pairs(ret)
+
+        return ret
+
+    @staticmethod
+    def _match_within_budget(
+        poly1: RoundedPolygon,
+        poly2: RoundedPolygon,
+        budget_ms: float,
+        on_refined: Optional[Callable[[List[Tuple[Cubic, Cubic]]], None]],
+        executor: Optional[Executor],
+    ) -> MatchedPairs:
+        deadline = time.perf_counter() + budget_ms / 1000.0
+
+        # one pending refinement per callback; without one, nothing is shared
+        key = on_refined if on_refined is not None else object()
+        refined = _refiner.submit(key, Morph.match, poly1, poly2, executor)
+
+        # The fallback is only computed if the exact match misses the budget, so
+        # stop waiting early enough to build it in time. Up to half the budget is
+        # kept for it; a fallback that wouldn't fit is built from fewer cubics.
+        cubic_count = sum(len(f.curves) for p in (poly1, poly2) for f in p.features)
+        reserve = min(cubic_count * _coarse_seconds_per_cubic, budget_ms / 2000.0)
+
+        def fallback() -> MatchedPairs:
+            remaining = max(0.0, deadline - time.perf_counter())
+            max_cubics = int(remaining / _coarse_seconds_per_cubic)
+            return Morph._coarse_pairs(poly1, poly2, cubic_count, max_cubics)
+
+        try:
+            return refined.result(
+                timeout=max(0.0, deadline - reserve - time.perf_counter())
+            )
+        except FuturesTimeoutError:
+            pass
+        except CancelledError:
+            # superseded by a newer match for the same callback
+            return fallback()
+        except Exception as e:
+            Morph._report_refine_error(e)
+            return fallback()
+
+        coarse = fallback()
+
+        if refined.done() and not refined.cancelled():
+            # finished while the fallback was built: worth using after all
+            error = refined.exception()
+            if error is None:
+                return refined.result()
+            Morph._report_refine_error(error)
+            return coarse
+
+        if on_refined is None:
+            refined.cancel()
+            return coarse
+
+        def deliver(future):
+            if future.cancelled() or not _refiner.is_latest(key, future):
+                return
+            error = future.exception()
+            if error is None:
+                on_refined(future.result())
+            else:
+                Morph._report_refine_error(error)
+
+        refined.add_done_callback(deliver)
+        return coarse
+
+    @staticmethod
+    def _coarse_pairs(
+        poly1: RoundedPolygon,
+        poly2: RoundedPolygon,
+        cubic_count: int,
+        max_cubics: int,
+    ) -> MatchedPairs:
+        """
+        The map_curves pairing of a budgeted match. If the shapes have more than
+        max_cubics cubics between them, each is first approximated by straight
+        lines through evenly spaced cubic start points, so the cost stays bounded.
+        """
+        global _coarse_seconds_per_cubic
+        if cubic_count > max_cubics:
+            per_shape = max(_COARSE_MIN_CUBICS, max_cubics // 2)
+            curves_a, curves_b = Morph._pair_curves(
+                Morph._decimated_outline(poly1, per_shape),
+                Morph._decimated_outline(poly2, per_shape),
+            )
+            return MatchedPairs(zip(curves_a, curves_b))
+
+        # only full map_curves runs feed the estimate, it is what it models
+        start = time.perf_counter()
+        curves_a, curves_b = Morph.map_curves(poly1, poly2)
+        elapsed = time.perf_counter() - start
+        if cubic_count:
+            _coarse_seconds_per_cubic = (
+                _coarse_seconds_per_cubic + elapsed / cubic_count
+            ) / 2
+        return MatchedPairs(zip(curves_a, curves_b))
+
+    @staticmethod
+    def _decimated_outline(poly: RoundedPolygon, count: int) -> List[Cubic]:
+        curves = poly.get_all_curves()
+        if len(curves) <= count:
+            return [c for c in curves if c.p0.dist_to(c.p3) > 0.001]
+        step = len(curves) / count
+        points = [curves[int(i * step)].p0 for i in range(count)]
+        return [
+            Cubic.straight_line(p.x, p.y, q.x, q.y)
+            for p, q in zip(points, points[1:] + points[:1])
+        ]
+
+    @staticmethod
+    def _report_refine_error(error: BaseException):
+        if tracing.warnings_on:
+            tracing.warning(
+                "morph.refine_failed", error=f"{type(error).__name__}: {error}"
+            )
 
+    @staticmethod
+    def _plan_walk(
+        bs1: MeasuredPolygon,
+        bs2: MeasuredPolygon,
+        b2_ends: List[float],
+        double_mapper: DoubleMapper,
+        poly2_cut_point: float,
+    ) -> Tuple[List[WalkChain], List[WalkChain]]:
+        """
+        Walks both polygons simultaneously, deciding the matched (Cubic, Cubic) pairs.
+        Whichever cubic ends sooner is consumed whole; the other is cut at the
+        corresponding point so their boundaries align.
+
+        Only progress values take part in the decisions (cutting a cubic never moves
+        its end), so the walk is planned without touching geometry. The result is one
+        chain per cubic on each side: the cubic's index, the Shape 1 progress of its
+        first step and the cut to make at each step it takes part in (None = consume
+        the rest whole). Each step emits exactly one segment on each side.
+        """
+        chains1: List[WalkChain] = []
+        chains2: List[WalkChain] = []
+
+        n1, n2 = bs1.size, bs2.size
+        i1, i2 = 0, 0
         step = 0
-        MorphDebugger.print_walking_header()
+        debug = tracing.debug_on
 
-        while b1 is not None and b2 is not None:
-            # Convert both cubics' end progress to Shape 1's space for comparison.
+        while i1 < n1 and i2 < n2:
+            # Both cubics' end progress in Shape 1's space for comparison.
             # Last cubic on either side is forced to 1.0 to guarantee both finish together.
-            b1a = 1.0 if i1 == bs1.size else b1.end_outline_progress
-            b2a = (
-                1.0
-                if i2 == bs2.size
-                # Undo shift to get original Shape 2 progress, then map_back to Shape 1 space
-                else double_mapper.map_back(
-                    (b2.end_outline_progress + poly2_cut_point) % 1.0
-                )
-            )
+            b1a = 1.0 if i1 == n1 - 1 else bs1[i1].end_outline_progress
+            b2a = b2_ends[i2]
 
             # smaller cubics determines split boundary
             min_b = min(b1a, b2a)
 
-            print(f"{step:<5} | b1a={b1a:<10.4f} | b2a={b2a:<12.4f} | min={min_b:.4f}")
+            if debug:
+                tracing.emit("morph.walk_step", step=step, b1a=b1a, b2a=b2a, min_b=min_b)
+
+            if not chains1 or chains1[-1][0] != i1:
+                chains1.append((i1, min_b, []))
+            if not chains2 or chains2[-1][0] != i2:
+                chains2.append((i2, min_b, []))
 
             # cut whichever extends past min_b
             if b1a > min_b + AngleEpsilon:
-                seg1, new_b1 = b1.cut_at_progress(min_b)
+                chains1[-1][2].append(min_b)
             else:
-                seg1 = b1
-                new_b1 = bs1.get_cubic(i1)
+                chains1[-1][2].append(None)
                 i1 += 1
 
             if b2a > min_b + AngleEpsilon:
                 # Convert min_b (Shape 1 space) -> Shape 2 original space -> bs2 local space
                 # map(min_b) gives Shape 2 original, subtract poly2_cut_point gives local
-                seg2, new_b2 = b2.cut_at_progress(
-                    (double_mapper.map(min_b) - poly2_cut_point) % 1.0
-                )
+                chains2[-1][2].append((double_mapper.map(min_b) - poly2_cut_point) % 1.0)
             else:
-                seg2 = b2
-                new_b2 = bs2.get_cubic(i2)
+                chains2[-1][2].append(None)
                 i2 += 1
 
-            ret.append((seg1.cubic, seg2.cubic))
-            b1 = new_b1
-            b2 = new_b2
             step += 1
 
-        if b1 is not None or b2 is not None:
-            print(
-                f"WARNING: Walking ended with b1={b1 is not None}, b2={b2 is not None}"
+        if (i1 < n1 or i2 < n2) and tracing.warnings_on:
+            tracing.warning(
+                "morph.walk_leftovers", i1=i1 + 1, n1=n1, i2=i2 + 1, n2=n2
             )
-            print(f"  i1={i1}/{bs1.size}, i2={i2}/{bs2.size}")
 
-        MorphDebugger.print_final_matched_pairs(ret)
+        return chains1, chains2
 
-        return ret
+    @staticmethod
+    def _cut_chains_by_span(
+        bs1: MeasuredPolygon,
+        bs2: MeasuredPolygon,
+        chains1: List[WalkChain],
+        chains2: List[WalkChain],
+        anchors: List[float],
+        executor: Executor,
+    ) -> Tuple[List[Cubic], List[Cubic]]:
+        """
+        Cuts the planned chains span by span on `executor`. Spans are the stretches
+        between consecutive anchors in Shape 1's progress space. Each side's chains
+        are split into contiguous runs, a run ending where the walk first passes an
+        anchor, so no cubic is split across two jobs and the concatenated result is
+        identical to the serial walk.
+        """
+        bounds = sorted(anchors)
+
+        def runs(measured: MeasuredPolygon, chains: List[WalkChain]):
+            # A chain's first progress can drop back across the 0/1 seam near the
+            # end of the walk (mapped Shape 2 ends wrap), so split on the furthest
+            # progress reached so far instead, which keeps walk order.
+            reached = list(accumulate((first for _, first, _ in chains), max))
+            splits = [0] + [bisect_right(reached, a) for a in bounds] + [len(chains)]
+            return [
+                [(measured[i], cuts) for i, _, cuts in chains[start:end]]
+                for start, end in zip(splits, splits[1:])
+            ]
+
+        spans1 = runs(bs1, chains1)
+        spans2 = runs(bs2, chains2)
+
+        futures = [
+            (executor.submit(_cut_chains, s1), executor.submit(_cut_chains, s2))
+            for s1, s2 in zip(spans1, spans2)
+            if s1 or s2
+        ]
+
+        segs1, segs2 = [], []
+        for f1, f2 in futures:
+            segs1.extend(f1.result())
+            segs2.extend(f2.result())
+        return segs1, segs2
 
     @staticmethod
     def as_cubics(
@@ -337,33 +972,142 @@ class Morph:
             )
         return result
 
+    @staticmethod
+    def merge_pairs(
+        matched_pairs: List[Tuple[Cubic, Cubic]],
+        tolerance: float = 0.5,
+        scale: float = 1.0,
+    ) -> List[Tuple[Cubic, Cubic]]:
+        """
+        Optional post-pass over `match` output that merges runs of adjacent pairs
+        whose sides can each be replaced by a single cubic.
+
+        `tolerance` is in output pixels and `scale` is output pixels per shape
+        unit (e.g. the cairo scale the morph is drawn with). A merge is kept only
+        while the accumulated deviation on both sides stays within tolerance, so
+        slivers and near-collinear runs collapse while real features stay put.
+        """
+        if not matched_pairs:
+            return []
+
+        max_error = tolerance / scale
+
+        result = []
+        cur1, cur2 = matched_pairs[0]
+        err1 = err2 = 0.0
+        for next1, next2 in matched_pairs[1:]:
+            merged1, e1 = Morph._merge_cubics(cur1, next1)
+            merged2, e2 = Morph._merge_cubics(cur2, next2)
+            if err1 + e1 <= max_error and err2 + e2 <= max_error:
+                cur1, cur2 = merged1, merged2
+                err1 += e1
+                err2 += e2
+            else:
+                result.append((cur1, cur2))
+                cur1, cur2 = next1, next2
+                err1 = err2 = 0.0
+        result.append((cur1, cur2))
+        return result
+
+    @staticmethod
+    def _merge_cubics(c1: Cubic, c2: Cubic) -> Tuple[Cubic, float]:
+        """
+        Single cubic replacing c1 followed by c2, with an upper bound of how far it
+        strays from them. Inverts a De Casteljau split at the arc length ratio; the
+        bound compares each half with the matching part of the merged cubic.
+        """
+        l1 = LengthMeasurer.measure_cubic(c1)
+        l2 = LengthMeasurer.measure_cubic(c2)
+
+        total = l1 + l2
+        t = l1 / total if total > 0 else 0.0
+
+        # outlines are not always closed between cubics, a gap counts as error
+        gap = c1.p3.dist_to(c2.p0)
+
+        # too uneven to invert the split: the sliver is absorbed by moving the
+        # other cubic's end onto its far end, nothing moves further than its length
+        if t < _MERGE_MIN_RATIO:
+            return Cubic(c1.p0, c2.p1, c2.p2, c2.p3), l1 + gap
+        if t > 1 - _MERGE_MIN_RATIO:
+            return Cubic(c1.p0, c1.p1, c1.p2, c2.p3), l2 + gap
+
+        merged = Cubic(
+            c1.p0,
+            c1.p0 + (c1.p1 - c1.p0) / t,
+            c2.p3 + (c2.p2 - c2.p3) / (1 - t),
+            c2.p3,
+        )
+
+        # The split halves share c1's first two and c2's last two control points
+        # (up to rounding), so each difference is mostly in the other two.
+        m1, m2 = merged.split(t)
+        error1 = Morph._bezier_difference_bound(
+            c1.p2.dist_to(m1.p2),
+            c1.p3.dist_to(m1.p3),
+            max(c1.p0.dist_to(m1.p0), c1.p1.dist_to(m1.p1)),
+        )
+        error2 = Morph._bezier_difference_bound(
+            c2.p1.dist_to(m2.p1),
+            c2.p0.dist_to(m2.p0),
+            max(c2.p3.dist_to(m2.p3), c2.p2.dist_to(m2.p2)),
+        )
+        return merged, max(error1, error2)
+
+    @staticmethod
+    def _bezier_difference_bound(inner: float, end: float, rest: float) -> float:
+        """
+        Upper bound of |c(s) - m(s)| over s in [0, 1] for two cubics whose control
+        points differ by `end` at one end, `inner` next to it and at most `rest` at
+        the other two: max of 3 s^2 (1 - s) inner + s^3 end, plus rest.
+        """
+        peak = end
+        if end < inner:
+            # interior maximum of the weighted sum, where its derivative is zero
+            s = 2 * inner / (3 * inner - end)
+            peak = max(peak, 3 * s * s * (1 - s) * inner + s * s * s * end)
+        return peak + rest
 
 class MappingHelper:
+    """
+    Greedy builder for the (progress1, progress2) anchor list.
+
+    The accepted pairs are kept in parallel arrays sorted by progress1, so each
+    add_mapping call is a single bisect plus an in-place insert instead of
+    rebuilding the key list from `mapping` every time.
+    """
+
     def __init__(self):
         self.mapping: list[tuple[float, float]] = []  # [(progress1, progress2), ...]
-        self.used_f1: set[MeasuredFeature] = set()
-        self.used_f2: set[MeasuredFeature] = set()
-
-    def add_mapping(self, f1: MeasuredFeature, f2: MeasuredFeature):
-        if f1 in self.used_f1 or f2 in self.used_f2:
-            return
+        self._progresses1: list[float] = []  # mapping[i][0], kept sorted
+        self._progresses2: list[float] = []  # mapping[i][1], same order
+        self.features: list[tuple[MeasuredFeature, MeasuredFeature]] = []  # same order
+        # ids of already mapped features. MeasuredFeature hashes by identity
+        # anyway, plain ints skip the Python-level __hash__/__eq__ calls
+        self.used_f1: set[int] = set()
+        self.used_f2: set[int] = set()
+
+    def add_mapping(self, f1: MeasuredFeature, f2: MeasuredFeature) -> bool:
+        """Adds the pair unless it conflicts with the mapping so far; True if added."""
+        if id(f1) in self.used_f1 or id(f2) in self.used_f2:
+            return False
 
         # binary search by f1.progress
-        progresses = [m[0] for m in self.mapping]
-        insertion_index = bisect_left(progresses, f1.progress)
+        progresses1 = self._progresses1
+        insertion_index = bisect_left(progresses1, f1.progress)
+
+        n = len(progresses1)
 
         # no duplicate progress
-        if (
-            insertion_index < len(self.mapping)
-            and self.mapping[insertion_index][0] == f1.progress
-        ):
+        if insertion_index < n and progresses1[insertion_index] == f1.progress:
             raise ValueError("There can't be two features with the same progress")
 
-        n = len(self.mapping)
-
         if n >= 1:
-            before1, before2 = self.mapping[(insertion_index + n - 1) % n]
-            after1, after2 = self.mapping[insertion_index % n]
+            progresses2 = self._progresses2
+            before_index = (insertion_index + n - 1) % n
+            after_index = insertion_index % n
+            before1, before2 = progresses1[before_index], progresses2[before_index]
+            after1, after2 = progresses1[after_index], progresses2[after_index]
 
             # discard too-close features
             if (
@@ -372,13 +1116,17 @@ class MappingHelper:
                 or progress_distance(f2.progress, before2) < DistanceEpsilon
                 or progress_distance(f2.progress, after2) < DistanceEpsilon
             ):
-                return
+                return False
 
             # ensure no crossings
             # one is fine (end <-> start crossing)
             if n > 1 and not progress_in_range(f2.progress, before2, after2):
-                return
+                return False
 
         self.mapping.insert(insertion_index, (f1.progress, f2.progress))
-        self.used_f1.add(f1)
-        self.used_f2.add(f2)
+        progresses1.insert(insertion_index, f1.progress)
+        self._progresses2.insert(insertion_index, f2.progress)
+        self.features.insert(insertion_index, (f1, f2))
+        self.used_f1.add(id(f1))
+        self.used_f2.add(id(f2))
+        return True
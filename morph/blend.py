@@ -0,0 +1,67 @@
+from typing import List, Sequence
+
+from geometry.bezier_geometry import Cubic
+from geometry.rounded_polygon import RoundedPolygon
+from .sequence import MorphSequence
+
+
+class BlendSpace:
+    """
+    Weighted blend of N shapes, sum(w_i * shape_i), for data-driven shapes.
+
+    The shapes are brought into one common segment topology the same way
+    MorphSequence does it (matching each shape to the next and cutting all of
+    them at every boundary). Their flattened control points are stacked as the
+    rows of an N x (8 * segment_count) matrix, so evaluating a set of weights is
+    a single matrix-vector product. Nothing else is recomputed when the weights
+    change, which makes per-frame weight updates cheap.
+
+    Weights are used as given. Barycentric weights (non-negative, summing to 1)
+    keep the result inside the span of the shapes; other weights extrapolate.
+
+    Attributes:
+        rows: Flattened control points per shape (see Cubic.to_coords).
+    """
+
+    def __init__(self, rows: List[List[float]]):
+        if not rows:
+            raise ValueError("A blend space needs at least one shape")
+        if len({len(r) for r in rows}) > 1:
+            raise ValueError("Shapes must share the same segment count")
+        self.rows = rows
+
+    @property
+    def shape_count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.rows[0]) // 8
+
+    @classmethod
+    def from_polygons(cls, polygons: List[RoundedPolygon]) -> "BlendSpace":
+        if len(polygons) == 1:
+            return cls([Cubic.to_coords(polygons[0].get_all_curves())])
+        sequence = MorphSequence.from_polygons(polygons, loop=False)
+        return cls(sequence.keyframes)
+
+    def as_cubics(self, weights: Sequence[float]) -> List[Cubic]:
+        """Blended shape for one weight per shape, closed like Morph.as_cubics."""
+        if len(weights) != len(self.rows):
+            raise ValueError(f"Expected {len(self.rows)} weights, got {len(weights)}")
+
+        # weights^T x rows, accumulated one row at a time
+        w0 = weights[0]
+        values = [w0 * v for v in self.rows[0]]
+        for w, row in zip(weights[1:], self.rows[1:]):
+            if w:
+                values = [acc + w * v for acc, v in zip(values, row)]
+
+        result = Cubic.from_coords(values)
+        if not result:
+            return []
+
+        # close the shape: last cubic's end point snaps to first cubic's start
+        last = result[-1]
+        result[-1] = Cubic(last.p0, last.p1, last.p2, result[0].p0)
+        return result
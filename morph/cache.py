@@ -0,0 +1,147 @@
+import hashlib
+import struct
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from geometry.rounded_polygon import RoundedPolygon
+from .bezier_morph import MatchedPairs, Morph
+
+
+# Packs one cubic's control points
+_CUBIC_STRUCT = struct.Struct("<8d")
+
+
+def polygon_fingerprint(polygon: RoundedPolygon) -> str:
+    """
+    Content hash of everything Morph.match reads from a polygon: the control
+    points of every feature's curves, plus the feature's type and convexity.
+    Equal fingerprints give equal matches, whichever objects they came from.
+    """
+    digest = hashlib.sha1()
+    for feature in polygon.features:
+        digest.update(b"C" if feature.type == "corner" else b"E")
+        digest.update(b"+" if feature.is_convex else b"-")
+        for c in feature.curves:
+            digest.update(
+                _CUBIC_STRUCT.pack(
+                    c.p0.x, c.p0.y, c.p1.x, c.p1.y, c.p2.x, c.p2.y, c.p3.x, c.p3.y
+                )
+            )
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+class MorphCache:
+    """
+    Matched pairs by (start, end) polygon fingerprint, safe to share between the
+    main loop and worker threads.
+
+    Attributes:
+        max_entries: Least recently used entries are dropped beyond this count.
+                     None keeps everything.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], MatchedPairs]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    @staticmethod
+    def key(poly1: RoundedPolygon, poly2: RoundedPolygon) -> Tuple[str, str]:
+        return polygon_fingerprint(poly1), polygon_fingerprint(poly2)
+
+    def get(self, key: Tuple[str, str]) -> Optional[MatchedPairs]:
+        with self._lock:
+            pairs = self._entries.get(key)
+            if pairs is not None:
+                self._entries.move_to_end(key)
+            return pairs
+
+    def put(self, key: Tuple[str, str], pairs: MatchedPairs):
+        with self._lock:
+            self._entries[key] = pairs
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def get_or_match(self, poly1: RoundedPolygon, poly2: RoundedPolygon) -> MatchedPairs:
+        """Cached pairs for the transition, matching (and caching) them on a miss."""
+        key = self.key(poly1, poly2)
+        pairs = self.get(key)
+        if pairs is None:
+            pairs = Morph.match(poly1, poly2)
+            self.put(key, pairs)
+        return pairs
+
+
+def _match_transition(poly1: RoundedPolygon, poly2: RoundedPolygon) -> MatchedPairs:
+    # runs in a worker process, module-level so it pickles
+    return Morph.match(poly1, poly2)
+
+
+def warm_up(
+    cache: MorphCache,
+    transitions: Iterable[Tuple[RoundedPolygon, RoundedPolygon]],
+    max_workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Matches every (start, end) transition that is not cached yet on a process
+    pool and puts the results into `cache` as each one completes, so early
+    finishers are usable before the whole batch is done.
+
+    `on_progress(done, total)` is called after every stored result, from the
+    calling thread. Blocks until all transitions are cached; run it on a
+    background thread to keep a UI responsive. Returns the number of
+    transitions matched.
+
+    Workers are started with "spawn" so a GTK parent process is never forked.
+    """
+    pending = {}
+    for poly1, poly2 in transitions:
+        key = cache.key(poly1, poly2)
+        if key not in pending and key not in cache:
+            pending[key] = (poly1, poly2)
+
+    total = len(pending)
+    if not total:
+        return 0
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = {
+            pool.submit(_match_transition, poly1, poly2): key
+            for key, (poly1, poly2) in pending.items()
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            cache.put(futures[future], future.result())
+            if on_progress is not None:
+                on_progress(done, total)
+
+    return total
+
+
+def cycle_transitions(
+    polygons: List[RoundedPolygon],
+) -> List[Tuple[RoundedPolygon, RoundedPolygon]]:
+    """Each polygon to the next, wrapping around, as in an animation cycle."""
+    return [(p, polygons[(i + 1) % len(polygons)]) for i, p in enumerate(polygons)]
+
+
+def all_transitions(
+    polygons: List[RoundedPolygon],
+) -> List[Tuple[RoundedPolygon, RoundedPolygon]]:
+    """Every ordered pair of distinct polygons."""
+    return [(p1, p2) for p1 in polygons for p2 in polygons if p1 is not p2]
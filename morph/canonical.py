@@ -0,0 +1,192 @@
+import math
+from heapq import heapify, heapreplace
+from typing import List
+
+from geometry.bezier_geometry import Cubic
+from geometry.rounded_polygon import RoundedPolygon
+from geometry.polygon_measure import DistanceEpsilon, MeasuredCubic, MeasuredPolygon
+
+from .bezier_morph import Morph
+
+
+class CanonicalShape:
+    """
+    A RoundedPolygon resampled into a fixed number of cubics, so any two canonical
+    shapes with the same segment count can be interpolated index by index without
+    a Morph.match step.
+
+    Resampling only subdivides (see morph/README.md), so the outline is exact:
+      1. The outline is rotated to start at its anchor corner: the corner whose
+         representative point lies closest to straight up from the center. This
+         is what lines shapes up against each other.
+      2. The outline is cut at every other corner, and each corner is given the
+         segment boundary nearest to its progress, moved just enough that every
+         cubic between two corners still gets a segment of its own.
+      3. Within each corner-to-corner span, every cubic keeps its own boundaries,
+         and the span's remaining segments go to whichever cubic has the longest
+         pieces, cutting it evenly by progress.
+
+    Every corner therefore starts a segment, and segment i covers roughly
+    [i / n, (i + 1) / n] of the perimeter on every shape, so corners at similar
+    progress on two shapes meet at the same boundary. Which corners meet is
+    still decided by arc length from the anchor, not by distance as in
+    Morph.match.
+
+    Attributes:
+        cubics: The segment_count resampled cubics, starting at the anchor.
+        coords: Their control points flattened to
+                [p0.x, p0.y, p1.x, p1.y, p2.x, p2.y, p3.x, p3.y, ...].
+    """
+
+    DEFAULT_SEGMENT_COUNT = 96
+
+    def __init__(self, cubics: List[Cubic]):
+        self.cubics = cubics
+        self.coords = Cubic.to_coords(cubics)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.cubics)
+
+    @classmethod
+    def from_polygon(
+        cls, polygon: RoundedPolygon, segment_count: int = DEFAULT_SEGMENT_COUNT
+    ) -> "CanonicalShape":
+        measured = MeasuredPolygon.measure_polygon(polygon)
+        measured = measured.cut_and_shift(cls._anchor_progress(polygon, measured))
+        # the anchor comes first, at (or within DistanceEpsilon of) progress 0
+        corners = sorted(
+            mf.progress for mf in measured.features if mf.feature.type == "corner"
+        )
+
+        spans = cls._split_spans(measured, corners[1:])
+        needed = sum(len(span) for span in spans)
+        if needed > segment_count:
+            raise ValueError(
+                f"Polygon has {needed} cubics between its corners, "
+                f"segment_count must be at least that (got {segment_count})"
+            )
+
+        boundaries = cls._span_boundaries(
+            [span[0].start_outline_progress for span in spans],
+            [len(span) for span in spans],
+            segment_count,
+        )
+
+        cubics = []
+        for span, first, last in zip(spans, boundaries, boundaries[1:] + [segment_count]):
+            pieces = cls._allocate_pieces(span, last - first)
+            for measured_cubic, piece_count in zip(span, pieces):
+                cubics.extend(cls._cut_evenly(measured_cubic, piece_count))
+        return cls(cubics)
+
+    @staticmethod
+    def _anchor_progress(polygon: RoundedPolygon, measured: MeasuredPolygon) -> float:
+        best_progress = 0.0
+        best_angle = math.inf
+        for mf in measured.features:
+            if mf.feature.type != "corner":
+                continue
+            pt = Morph.feature_representative_point(mf.feature)
+            dx, dy = pt.x - polygon.center_x, pt.y - polygon.center_y
+            # angle away from "up" (-y in cairo's coordinate space)
+            angle = abs(math.atan2(dx, -dy))
+            if angle < best_angle:
+                best_angle = angle
+                best_progress = mf.progress
+        return best_progress
+
+    @staticmethod
+    def _split_spans(
+        measured: MeasuredPolygon, cuts: List[float]
+    ) -> List[List[MeasuredCubic]]:
+        """
+        The measured cubics cut at every progress in `cuts`, grouped between them.
+        Cuts that would leave an empty group (coinciding corners) are dropped.
+        """
+        spans: List[List[MeasuredCubic]] = [[]]
+        cuts = iter(cuts)
+        cut = next(cuts, None)
+        for rest in measured:
+            while cut is not None and cut < rest.end_outline_progress - DistanceEpsilon:
+                if cut > rest.start_outline_progress + DistanceEpsilon:
+                    piece, rest = rest.cut_at_progress(cut)
+                    spans[-1].append(piece)
+                if spans[-1]:
+                    spans.append([])
+                cut = next(cuts, None)
+            spans[-1].append(rest)
+        return spans
+
+    @staticmethod
+    def _span_boundaries(
+        progresses: List[float], min_pieces: List[int], segment_count: int
+    ) -> List[int]:
+        """
+        The segment index each span starts at: the one nearest to its progress,
+        moved as little as needed to leave every span its min_pieces segments.
+        """
+        boundaries = [0]
+        for progress, before in zip(progresses[1:], min_pieces):
+            boundaries.append(max(round(progress * segment_count), boundaries[-1] + before))
+        end = segment_count
+        for i in range(len(boundaries) - 1, 0, -1):
+            boundaries[i] = min(boundaries[i], end - min_pieces[i])
+            end = boundaries[i]
+        return boundaries
+
+    @staticmethod
+    def _allocate_pieces(span: List[MeasuredCubic], segment_count: int) -> List[int]:
+        """
+        Number of pieces per cubic, at least one each. Extra pieces go one at a
+        time to the cubic whose pieces are currently longest (progress-wise).
+        """
+        pieces = [1] * len(span)
+        heap = [
+            (-(mc.end_outline_progress - mc.start_outline_progress), i)
+            for i, mc in enumerate(span)
+        ]
+        heapify(heap)
+
+        for _ in range(segment_count - len(span)):
+            _, i = heap[0]
+            pieces[i] += 1
+            mc = span[i]
+            size = mc.end_outline_progress - mc.start_outline_progress
+            heapreplace(heap, (-size / pieces[i], i))
+        return pieces
+
+    @staticmethod
+    def _cut_evenly(measured_cubic: MeasuredCubic, piece_count: int) -> List[Cubic]:
+        start = measured_cubic.start_outline_progress
+        step = (measured_cubic.end_outline_progress - start) / piece_count
+
+        result = []
+        rest = measured_cubic
+        for k in range(1, piece_count):
+            piece, rest = rest.cut_at_progress(start + step * k)
+            result.append(piece.cubic)
+        result.append(rest.cubic)
+        return result
+
+    @staticmethod
+    def interpolate(
+        start: "CanonicalShape", end: "CanonicalShape", progress: float
+    ) -> List[Cubic]:
+        """
+        Shape at `progress` between two canonical shapes, a flat lerp of their
+        control points. Closed the same way as Morph.as_cubics.
+        """
+        if start.segment_count != end.segment_count:
+            raise ValueError("Canonical shapes must have the same segment count")
+
+        result = Cubic.from_coords(
+            [a + (b - a) * progress for a, b in zip(start.coords, end.coords)]
+        )
+        if not result:
+            return []
+
+        # close the shape: last cubic's end point snaps to first cubic's start
+        last = result[-1]
+        result[-1] = Cubic(last.p0, last.p1, last.p2, result[0].p0)
+        return result
@@ -1,8 +1,9 @@
 import math
 from typing import List
-from pprint import pprint
 from dataclasses import dataclass
 
+from geometry import tracing
+
 
 @dataclass
 class MorphPoint:
@@ -107,8 +108,6 @@ class Morph:
 
     @staticmethod
     def map_vertices(v1: list, v2: list):
-        print("\n" + "=" * 30)
-
         # align winding
         if Morph.get_winding_order(v1) != Morph.get_winding_order(v2):
             v2 = v2[::-1]
@@ -122,26 +121,26 @@ class Morph:
         v1_mp = Morph.create_progress_points(v1)
         v2_mp = Morph.create_progress_points(v2)
 
-        print("\n--- Initial Points (V1) ---")
-        pprint(v1_mp)
-        print("\n--- Initial Points (V2) ---")
-        pprint(v2_mp)
-
         # equalize vertex counts
         equalized_v1_mp = Morph.balance_morph_points(v1_mp, len(v2_mp))
 
-        print(f"\n--- Equalized V1 (Now {len(equalized_v1_mp)} points) ---")
-        pprint(equalized_v1_mp)
-
         # 1:1 mapping
-        print("\n--- Mapping (V1 -> V2) ---")
         mapping = Morph.map_vertices_1_to_1(equalized_v1_mp, v2_mp)
-        pprint(mapping)
 
         mapped_v1 = [p1.to_tuple() for p1, p2 in mapping]
         mapped_v2 = [p2.to_tuple() for p1, p2 in mapping]
 
-        print("=" * 30 + "\n")
+        if tracing.debug_on:
+            tracing.emit(
+                "linear_morph.map_vertices",
+                initial=[
+                    [(p.progress, p.x, p.y) for p in v1_mp],
+                    [(p.progress, p.x, p.y) for p in v2_mp],
+                ],
+                equalized=len(equalized_v1_mp),
+                mapping=[mapped_v1, mapped_v2],
+                swapped=swapped,
+            )
         return (mapped_v2, mapped_v1) if swapped else (mapped_v1, mapped_v2)
 
     @staticmethod
@@ -150,8 +149,8 @@ class Morph:
             (p1[0] + (p2[0] - p1[0]) * alpha, p1[1] + (p2[1] - p1[1]) * alpha)
             for p1, p2 in zip(v1, v2)
         ]
-        print(f"\n=== alpha: {alpha} ===")
-        pprint(morphed)
+        if tracing.debug_on:
+            tracing.emit("linear_morph.interpolated", alpha=alpha, points=morphed)
         return morphed
 
         # so the old algo goes like this.
@@ -0,0 +1,167 @@
+from typing import List, Optional
+
+from geometry import tracing
+from geometry.bezier_geometry import Cubic
+from geometry.rounded_polygon import RoundedPolygon
+from geometry.polygon_measure import AngleEpsilon, DoubleMapper, MeasuredPolygon
+
+from .bezier_morph import Morph
+
+
+class MorphSequence:
+    """
+    Morph through several keyframe shapes that all share one common subdivision.
+
+    It generalizes the Morph.match walk (see morph/README.md) from two shapes to
+    many. Adjacent keyframes are related by their own corner mapping. Chaining
+    those mappings expresses every keyframe's cubic boundaries in keyframe 0's
+    progress space, and one walk over all keyframes at once cuts each of them at
+    every other keyframe's boundaries. Every keyframe ends up with the same
+    segment count and boundaries, so any point in the sequence is a single
+    indexed lerp with no re-matching. For two keyframes the pairs are the same
+    as Morph.match.
+
+    Attributes:
+        keyframes: Flattened control points per keyframe (see Cubic.to_coords).
+        loop:      True if the last transition leads back to the first shape.
+    """
+
+    def __init__(self, keyframes: List[List[float]], loop: bool = False):
+        if len({len(k) for k in keyframes}) > 1:
+            raise ValueError("Keyframes must share the same segment count")
+        self.keyframes = keyframes
+        self.loop = loop
+
+    @property
+    def transition_count(self) -> int:
+        return len(self.keyframes) - 1
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.keyframes[0]) // 8 if self.keyframes else 0
+
+    @classmethod
+    def from_polygons(
+        cls, polygons: List[RoundedPolygon], loop: bool = True
+    ) -> "MorphSequence":
+        """
+        Builds the shared subdivision for `polygons` in order. With `loop`, a final
+        transition back to polygons[0] is added (as an extra keyframe with its own
+        cuts, tracing the same outline).
+        """
+        if len(polygons) < 2:
+            raise ValueError("A morph sequence needs at least two polygons")
+        if loop:
+            polygons = list(polygons) + [polygons[0]]
+
+        measured = [MeasuredPolygon.measure_polygon(p) for p in polygons]
+
+        # mappers[i] maps keyframe i progress -> keyframe i + 1 progress
+        mappers = []
+        for m1, m2 in zip(measured, measured[1:]):
+            corners1 = [f for f in m1.features if f.feature.type == "corner"]
+            corners2 = [f for f in m2.features if f.feature.type == "corner"]
+            mappers.append(DoubleMapper(*Morph.do_mapping(corners1, corners2)))
+
+        # each keyframe starts where keyframe 0's progress 0.0 maps to
+        cut_points = [0.0]
+        for mapper in mappers:
+            cut_points.append(mapper.map(cut_points[-1]))
+
+        shifted = [m.cut_and_shift(cut) for m, cut in zip(measured, cut_points)]
+
+        # cubic ends of every keyframe in keyframe 0's space; cutting never moves
+        # them. The last one is forced to 1.0 so all keyframes finish together.
+        ends = []
+        for i, bs in enumerate(shifted):
+            values = [
+                (bs[j].end_outline_progress + cut_points[i]) % 1.0
+                for j in range(bs.size - 1)
+            ]
+            for mapper in reversed(mappers[:i]):
+                values = mapper.map_back_many(values)
+            ends.append(values + [1.0])
+
+        segments = cls._walk(shifted, ends, mappers, cut_points)
+        return cls([Cubic.to_coords(s) for s in segments], loop=loop)
+
+    @staticmethod
+    def _walk(
+        shifted: List[MeasuredPolygon],
+        ends: List[List[float]],
+        mappers: List[DoubleMapper],
+        cut_points: List[float],
+    ) -> List[List[Cubic]]:
+        """
+        The Morph.match walk over all keyframes at once: at each step the cubic
+        ending soonest (in keyframe 0's space) decides the boundary, every
+        keyframe whose cubic extends past it is cut there and the rest are
+        consumed whole.
+        """
+        count = len(shifted)
+        indices = [0] * count
+        current = [bs.get_cubic(0) for bs in shifted]
+        segments = [[] for _ in range(count)]
+
+        while all(indices[i] < shifted[i].size for i in range(count)):
+            step_ends = [ends[i][indices[i]] for i in range(count)]
+            min_b = min(step_ends)
+
+            # min_b in every keyframe's own progress space
+            local = min_b
+            for i in range(count):
+                if i > 0:
+                    local = mappers[i - 1].map(local)
+
+                if step_ends[i] > min_b + AngleEpsilon:
+                    seg, current[i] = current[i].cut_at_progress(
+                        (local - cut_points[i]) % 1.0
+                    )
+                else:
+                    seg = current[i]
+                    indices[i] += 1
+                    current[i] = shifted[i].get_cubic(indices[i])
+                segments[i].append(seg.cubic)
+
+        if any(c is not None for c in current) and tracing.warnings_on:
+            tracing.warning("morph.sequence_walk_leftovers", indices=indices)
+
+        return segments
+
+    def as_cubics(self, position: float) -> List[Cubic]:
+        """
+        Shape at `position`, where the integer part selects the transition and the
+        fractional part is its progress (so easing is applied per transition by
+        the caller). Looping sequences wrap around, others clamp to their ends.
+        """
+        n = self.transition_count
+        if n < 1:
+            return Cubic.from_coords(self.keyframes[0]) if self.keyframes else []
+
+        if self.loop:
+            position %= n
+        else:
+            position = max(0.0, min(float(n), position))
+
+        index = min(int(position), n - 1)
+        progress = position - index
+
+        result = Cubic.from_coords(
+            [
+                a + (b - a) * progress
+                for a, b in zip(self.keyframes[index], self.keyframes[index + 1])
+            ]
+        )
+        if not result:
+            return []
+
+        # close the shape: last cubic's end point snaps to first cubic's start
+        last = result[-1]
+        result[-1] = Cubic(last.p0, last.p1, last.p2, result[0].p0)
+        return result
+
+    def keyframe_cubics(self, index: int) -> Optional[List[Cubic]]:
+        """The subdivided cubics of one keyframe, or None if out of range."""
+        if 0 <= index < len(self.keyframes):
+            return Cubic.from_coords(self.keyframes[index])
+        return None
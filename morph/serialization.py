@@ -0,0 +1,321 @@
+"""
+Compact binary format for RoundedPolygons and Morph.match results.
+
+Layout (little-endian). Every section starts at a multiple of 4 bytes, and the
+control point block at byte 48, so each one can be wrapped in place (memoryview
+casts, np.frombuffer, an mmap) without parsing:
+
+    header   48 bytes, see HEADER plus CENTER
+               magic "CSHP", version, kind, float size (4 or 8), flags,
+               cubic count, feature count, second feature count, anchor count,
+               polygon center (two float64)
+    points   cubic count * 8 floats (float32 or float64)
+               polygon: p0.x, p0.y, ... p3.y per cubic, as Cubic.to_coords
+               morph:   one pair per 16 floats, as morph.shared.pairs_to_coords
+    polygon sections
+      offsets  (feature count + 1) uint32, first cubic index of each feature
+               followed by the cubic count
+      flags    feature count uint8, see FLAG_CORNER / FLAG_CONVEX
+    morph sections (only if the HAS_PLAN flag is set)
+      anchors  anchor count * 2 uint32, (corner index 1, corner index 2) pairs
+      flags    feature count + second feature count uint8, the corner
+               convexity (FLAG_CORNER | FLAG_CONVEX) of MatchPlan.topology1
+               then topology2
+
+to_text / from_text convert between the binary form and an equivalent JSON
+document for debugging.
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from geometry.bezier_geometry import Cubic
+from geometry.rounded_polygon import Feature, RoundedPolygon
+from .bezier_morph import MatchedPairs, MatchPlan
+from .shared import pairs_to_coords
+
+MAGIC = b"CSHP"
+VERSION = 1
+
+KIND_POLYGON = 1
+KIND_MORPH = 2
+
+# header flags
+HAS_PLAN = 1
+
+# feature flags
+FLAG_CORNER = 1
+FLAG_CONVEX = 2
+
+HEADER = struct.Struct("<4sHBBIIIII4x")
+CENTER = struct.Struct("<2d")
+HEADER_SIZE = HEADER.size + CENTER.size  # 48
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+@dataclass(frozen=True)
+class Header:
+    version: int
+    kind: int
+    float_size: int
+    flags: int
+    cubic_count: int
+    feature_count: int
+    feature_count2: int
+    anchor_count: int
+    center_x: float
+    center_y: float
+
+
+def read_header(buffer: Buffer) -> Header:
+    with memoryview(buffer) as view:
+        if view.nbytes < HEADER_SIZE:
+            raise ValueError("Buffer is too short for a header")
+        magic, *fields = HEADER.unpack_from(view, 0)
+        center = CENTER.unpack_from(view, HEADER.size)
+
+    if magic != MAGIC:
+        raise ValueError(f"Not a serialized shape (magic {magic!r})")
+    header = Header(*fields, *center)
+    if header.version != VERSION:
+        raise ValueError(f"Unsupported format version {header.version}")
+    if header.float_size not in (4, 8):
+        raise ValueError(f"Unsupported float size {header.float_size}")
+    return header
+
+
+class ShapeView:
+    """
+    Typed, zero-copy views of the sections of a serialized buffer. Nothing is
+    decoded up front; load_polygon and load_morph build objects from these.
+
+    Attributes:
+        header:          The decoded Header.
+        coords:          Control points, a memoryview of "f" or "d".
+        feature_offsets: Polygon only, memoryview of "I" (feature count + 1).
+        anchors:         Morph only, memoryview of "I" (2 per anchor pair).
+        feature_flags:   memoryview of "B", per feature (polygon) or per corner
+                         of topology1 then topology2 (morph).
+    """
+
+    def __init__(self, buffer: Buffer):
+        self.header = h = read_header(buffer)
+        view = memoryview(buffer).cast("B")
+
+        offset = HEADER_SIZE
+        size = h.cubic_count * 8 * h.float_size
+        float_format = "d" if h.float_size == 8 else "f"
+        self.coords = view[offset : offset + size].cast(float_format)
+        offset += size
+
+        self.feature_offsets = None
+        self.anchors = None
+        if h.kind == KIND_POLYGON:
+            size = (h.feature_count + 1) * 4
+            self.feature_offsets = view[offset : offset + size].cast("I")
+            offset += size
+        elif h.kind == KIND_MORPH:
+            size = h.anchor_count * 2 * 4
+            self.anchors = view[offset : offset + size].cast("I")
+            offset += size
+        else:
+            raise ValueError(f"Unknown kind {h.kind}")
+
+        size = h.feature_count + h.feature_count2
+        self.feature_flags = view[offset : offset + size]
+        if len(self.feature_flags) != size:
+            raise ValueError("Buffer is truncated")
+
+    def release(self):
+        for v in (self.coords, self.feature_offsets, self.anchors, self.feature_flags):
+            if v is not None:
+                v.release()
+
+
+def _pack(
+    kind: int,
+    coords: Sequence[float],
+    cubic_count: int,
+    double: bool,
+    flags: int = 0,
+    feature_count: int = 0,
+    feature_count2: int = 0,
+    center: Tuple[float, float] = (0.0, 0.0),
+    offsets: Sequence[int] = (),
+    anchors: Sequence[int] = (),
+    feature_flags: Sequence[int] = (),
+) -> bytes:
+    float_size = 8 if double else 4
+    header = HEADER.pack(
+        MAGIC, VERSION, kind, float_size, flags,
+        cubic_count, feature_count, feature_count2, len(anchors) // 2,
+    )  # fmt: skip
+    return b"".join(
+        (
+            header,
+            CENTER.pack(*center),
+            array("d" if double else "f", coords).tobytes(),
+            array("I", offsets).tobytes(),
+            array("I", anchors).tobytes(),
+            bytes(feature_flags),
+        )
+    )
+
+
+def _feature_flags(feature: Feature) -> int:
+    flags = FLAG_CORNER if feature.type == "corner" else 0
+    return flags | (FLAG_CONVEX if feature.is_convex else 0)
+
+
+def dump_polygon(polygon: RoundedPolygon, double: bool = True) -> bytes:
+    """Serializes a polygon; double=False stores control points as float32."""
+    offsets = [0]
+    for f in polygon.features:
+        offsets.append(offsets[-1] + len(f.curves))
+
+    return _pack(
+        KIND_POLYGON,
+        Cubic.to_coords(polygon.get_all_curves()),
+        offsets[-1],
+        double,
+        feature_count=len(polygon.features),
+        center=(polygon.center_x, polygon.center_y),
+        offsets=offsets,
+        feature_flags=[_feature_flags(f) for f in polygon.features],
+    )
+
+
+def load_polygon(buffer: Buffer) -> RoundedPolygon:
+    view = ShapeView(buffer)
+    h = view.header
+    if h.kind != KIND_POLYGON:
+        raise ValueError("Buffer does not hold a polygon")
+
+    cubics = Cubic.from_coords(view.coords)
+    offsets = view.feature_offsets
+    features = [
+        Feature(
+            cubics[offsets[i] : offsets[i + 1]],
+            "corner" if flags & FLAG_CORNER else "edge",
+            bool(flags & FLAG_CONVEX),
+        )
+        for i, flags in enumerate(view.feature_flags)
+    ]
+    view.release()
+    return RoundedPolygon(features, h.center_x, h.center_y)
+
+
+def dump_morph(
+    matched_pairs: Sequence[Tuple[Cubic, Cubic]], double: bool = True
+) -> bytes:
+    """
+    Serializes Morph.match output, including its MatchPlan when it has one;
+    double=False stores control points as float32.
+    """
+    plan: Optional[MatchPlan] = getattr(matched_pairs, "plan", None)
+    if plan is None:
+        return _pack(
+            KIND_MORPH, pairs_to_coords(matched_pairs), 2 * len(matched_pairs), double
+        )
+
+    return _pack(
+        KIND_MORPH,
+        pairs_to_coords(matched_pairs),
+        2 * len(matched_pairs),
+        double,
+        flags=HAS_PLAN,
+        feature_count=len(plan.topology1),
+        feature_count2=len(plan.topology2),
+        anchors=[i for pair in plan.anchors for i in pair],
+        feature_flags=[
+            FLAG_CORNER | (FLAG_CONVEX if convex else 0)
+            for convex in plan.topology1 + plan.topology2
+        ],
+    )
+
+
+def load_morph(buffer: Buffer) -> MatchedPairs:
+    view = ShapeView(buffer)
+    h = view.header
+    if h.kind != KIND_MORPH:
+        raise ValueError("Buffer does not hold a morph")
+
+    cubics = Cubic.from_coords(view.coords)
+    pairs = list(zip(cubics[0::2], cubics[1::2]))
+
+    plan = None
+    if h.flags & HAS_PLAN:
+        anchors = view.anchors
+        topology = [bool(f & FLAG_CONVEX) for f in view.feature_flags]
+        plan = MatchPlan(
+            tuple((anchors[i], anchors[i + 1]) for i in range(0, len(anchors), 2)),
+            tuple(topology[: h.feature_count]),
+            tuple(topology[h.feature_count :]),
+        )
+    view.release()
+    return MatchedPairs(pairs, plan)
+
+
+def load_file(path: str) -> Union[RoundedPolygon, MatchedPairs]:
+    """Loads a polygon or morph file through mmap."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if read_header(mapped).kind == KIND_POLYGON:
+                return load_polygon(mapped)
+            return load_morph(mapped)
+
+
+def to_text(buffer: Buffer) -> str:
+    """JSON rendering of a serialized buffer, field for field."""
+    view = ShapeView(buffer)
+    h = view.header
+    doc = {
+        "version": h.version,
+        "kind": "polygon" if h.kind == KIND_POLYGON else "morph",
+        "float_size": h.float_size,
+        "flags": h.flags,
+        "center": [h.center_x, h.center_y],
+        "coords": [
+            list(view.coords[i : i + 8]) for i in range(0, len(view.coords), 8)
+        ],
+        "feature_flags": list(view.feature_flags),
+    }
+    if view.feature_offsets is not None:
+        doc["feature_offsets"] = list(view.feature_offsets)
+    if view.anchors is not None:
+        doc["anchors"] = [
+            list(view.anchors[i : i + 2]) for i in range(0, len(view.anchors), 2)
+        ]
+        doc["feature_count"] = h.feature_count
+    view.release()
+    return json.dumps(doc, indent=1)
+
+
+def from_text(text: str) -> bytes:
+    """Inverse of to_text."""
+    doc = json.loads(text)
+    coords: List[float] = [v for row in doc["coords"] for v in row]
+    feature_flags = doc["feature_flags"]
+    offsets = doc.get("feature_offsets", [])
+    feature_count = (
+        len(offsets) - 1 if doc["kind"] == "polygon" else doc.get("feature_count", 0)
+    )
+
+    return _pack(
+        KIND_POLYGON if doc["kind"] == "polygon" else KIND_MORPH,
+        coords,
+        len(coords) // 8,
+        doc["float_size"] == 8,
+        flags=doc["flags"],
+        feature_count=feature_count,
+        feature_count2=len(feature_flags) - feature_count,
+        center=tuple(doc["center"]),
+        offsets=offsets,
+        anchors=[i for pair in doc.get("anchors", []) for i in pair],
+        feature_flags=feature_flags,
+    )
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import struct
+import time
+from dataclasses import dataclass, field
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple, Union
+
+from geometry.corner_rounding import CornerRounding
+from geometry.rounded_polygon import RoundedPolygon
+from .bezier_morph import MatchedPairs, Morph
+from .cache import MorphCache, polygon_fingerprint
+
+# Keyword arguments for RoundedPolygon.create
+PolygonSpec = Dict[str, Any]
+ShapeRequest = Union[RoundedPolygon, PolygonSpec]
+
+
+def spec_fingerprint(spec: PolygonSpec) -> str:
+    """
+    Content hash of a RoundedPolygon.create spec. Specs that differ only in how
+    numbers are written (ints vs floats, omitted defaults) hash the same.
+    """
+    rounding = spec.get("rounding") or CornerRounding.UNROUNDED()
+    per_vertex = spec.get("per_vertex_rounding") or []
+
+    digest = hashlib.sha1(b"spec")
+    vertices = [float(v) for v in spec["vertices"]]
+    digest.update(struct.pack(f"<I{len(vertices)}d", len(vertices), *vertices))
+    digest.update(struct.pack("<2d", rounding.radius, rounding.smoothing))
+    for r in per_vertex:
+        digest.update(struct.pack("<2d", r.radius, r.smoothing))
+    for name in ("center_x", "center_y"):
+        value = spec.get(name)
+        digest.update(b"-" if value is None else struct.pack("<d", value))
+    return digest.hexdigest()
+
+
+def shape_fingerprint(shape: ShapeRequest) -> str:
+    if isinstance(shape, RoundedPolygon):
+        return polygon_fingerprint(shape)
+    return spec_fingerprint(shape)
+
+
+def _create_and_match(start: ShapeRequest, end: ShapeRequest) -> MatchedPairs:
+    # runs on the executor, module-level so process pools can pickle it
+    if not isinstance(start, RoundedPolygon):
+        start = RoundedPolygon.create(**start)
+    if not isinstance(end, RoundedPolygon):
+        end = RoundedPolygon.create(**end)
+    return Morph.match(start, end)
+
+
+@dataclass
+class MorphServiceMetrics:
+    """
+    Snapshot of an AsyncMorphService's counters.
+
+    Attributes:
+        queue_depth:     Computations waiting for an executor slot.
+        running:         Computations holding an executor slot.
+        requests:        Calls to AsyncMorphService.match.
+        computations:    Distinct computations started (requests minus coalesced
+                         and cached ones).
+        coalesced:       Requests that joined an identical in-flight computation.
+        cache_hits:      Requests answered from the cache.
+        cancelled:       Computations dropped because every requester cancelled.
+        mean_latency_ms: Mean time from request to result, over answered requests.
+        max_latency_ms:  Slowest request to result.
+        mean_queue_ms:   Mean time computations waited for an executor slot.
+    """
+
+    queue_depth: int = 0
+    running: int = 0
+    requests: int = 0
+    computations: int = 0
+    coalesced: int = 0
+    cache_hits: int = 0
+    cancelled: int = 0
+    mean_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    mean_queue_ms: float = 0.0
+
+
+@dataclass
+class _Job:
+    task: Optional["asyncio.Task[MatchedPairs]"] = None
+    waiters: int = 0
+    queued_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+
+
+class AsyncMorphService:
+    """
+    Morph.match for asyncio callers: polygon creation and matching run on an
+    executor, so the event loop never blocks on them.
+
+    Requests are keyed by the fingerprints of both shapes. A request whose key is
+    already being computed awaits that computation instead of starting another.
+    Cancelling a request only cancels the computation once every request waiting
+    on it is cancelled; a computation still queued for a slot is then dropped,
+    while one already on the executor runs to completion and is discarded.
+
+    Attributes:
+        cache: Optional MorphCache that results are read from and stored in,
+               under the same (start, end) fingerprint keys.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 1,
+        cache: Optional[MorphCache] = None,
+    ):
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="morph-service"
+        )
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._jobs: Dict[Tuple[str, str], _Job] = {}
+        self.cache = cache
+
+        self._metrics = MorphServiceMetrics()
+        self._answered = 0
+        self._started = 0
+        self._latency_total = 0.0
+        self._queue_total = 0.0
+
+    async def match(self, start: ShapeRequest, end: ShapeRequest) -> MatchedPairs:
+        """
+        Matched pairs from `start` to `end`, each either a RoundedPolygon or the
+        keyword arguments of RoundedPolygon.create.
+        """
+        requested_at = time.perf_counter()
+        self._metrics.requests += 1
+        key = (shape_fingerprint(start), shape_fingerprint(end))
+
+        if self.cache is not None:
+            pairs = self.cache.get(key)
+            if pairs is not None:
+                self._metrics.cache_hits += 1
+                self._record_latency(requested_at)
+                return pairs
+
+        job = self._jobs.get(key)
+        if job is None:
+            job = _Job()
+            job.task = asyncio.ensure_future(self._compute(key, job, start, end))
+            job.task.add_done_callback(lambda _: self._forget(key, job))
+            self._jobs[key] = job
+            self._metrics.computations += 1
+        else:
+            self._metrics.coalesced += 1
+
+        job.waiters += 1
+        try:
+            pairs = await asyncio.shield(job.task)
+        except asyncio.CancelledError:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.task.done():
+                # later requests for the key start over instead of joining this one
+                self._forget(key, job)
+                job.task.cancel()
+                self._metrics.cancelled += 1
+            raise
+
+        self._record_latency(requested_at)
+        return pairs
+
+    async def _compute(
+        self, key: Tuple[str, str], job: _Job, start: ShapeRequest, end: ShapeRequest
+    ) -> MatchedPairs:
+        async with self._slots:
+            job.started_at = time.perf_counter()
+            self._started += 1
+            self._queue_total += job.started_at - job.queued_at
+
+            loop = asyncio.get_running_loop()
+            pairs = await loop.run_in_executor(
+                self._executor, _create_and_match, start, end
+            )
+
+        if self.cache is not None:
+            self.cache.put(key, pairs)
+        return pairs
+
+    def _forget(self, key: Tuple[str, str], job: _Job):
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+
+    def _record_latency(self, requested_at: float):
+        latency_ms = (time.perf_counter() - requested_at) * 1000
+        self._answered += 1
+        self._latency_total += latency_ms
+        self._metrics.max_latency_ms = max(self._metrics.max_latency_ms, latency_ms)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.started_at is None)
+
+    @property
+    def metrics(self) -> MorphServiceMetrics:
+        m = self._metrics
+        return MorphServiceMetrics(
+            queue_depth=self.queue_depth,
+            running=len(self._jobs) - self.queue_depth,
+            requests=m.requests,
+            computations=m.computations,
+            coalesced=m.coalesced,
+            cache_hits=m.cache_hits,
+            cancelled=m.cancelled,
+            mean_latency_ms=self._latency_total / self._answered if self._answered else 0.0,
+            max_latency_ms=m.max_latency_ms,
+            mean_queue_ms=self._queue_total * 1000 / self._started if self._started else 0.0,
+        )
+
+    def close(self):
+        """Cancels pending computations and shuts down the executor if it was created here."""
+        for job in list(self._jobs.values()):
+            job.task.cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncMorphService":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
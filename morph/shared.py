@@ -0,0 +1,157 @@
+import hashlib
+from array import array
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from geometry.bezier_geometry import Cubic
+
+# Doubles per matched pair: both cubics' control points, see pairs_to_coords
+PAIR_STRIDE = 16
+
+
+def pairs_to_coords(matched_pairs: Sequence[Tuple[Cubic, Cubic]]) -> array:
+    """
+    Flattens matched pairs to one double array, PAIR_STRIDE values per pair: the
+    start cubic's 8 control point coordinates, then the end cubic's (each laid
+    out as in Cubic.to_coords).
+    """
+    values = array("d")
+    for c1, c2 in matched_pairs:
+        values.extend(Cubic.to_coords([c1, c2]))
+    return values
+
+
+@dataclass(frozen=True)
+class SharedMorphDescriptor:
+    """
+    Picklable handle to a morph published in shared memory. This is all a worker
+    process needs to attach, instead of the pairs themselves.
+
+    Attributes:
+        name:       Shared memory segment name.
+        pair_count: Matched pairs in the segment.
+    """
+
+    name: str
+    pair_count: int
+
+
+class SharedMorph:
+    """
+    A worker's read-only, zero-copy view of a published morph.
+
+    Attributes:
+        coords: Read-only memoryview of pair_count * PAIR_STRIDE doubles, laid out
+                as in pairs_to_coords.
+    """
+
+    def __init__(self, descriptor: SharedMorphDescriptor):
+        self.descriptor = descriptor
+        try:
+            # attaching must not make this process responsible for unlinking
+            self._shm = shared_memory.SharedMemory(name=descriptor.name, track=False)
+        except TypeError:
+            # Python < 3.13 always tracks; fine for pools sharing the owner's tracker
+            self._shm = shared_memory.SharedMemory(name=descriptor.name)
+        size = descriptor.pair_count * PAIR_STRIDE * 8
+        self._buf = self._shm.buf[:size]
+        self.coords = self._buf.cast("d").toreadonly()
+
+    @property
+    def pair_count(self) -> int:
+        return self.descriptor.pair_count
+
+    def pair(self, index: int) -> Tuple[Cubic, Cubic]:
+        start = index * PAIR_STRIDE
+        c1, c2 = Cubic.from_coords(self.coords[start : start + PAIR_STRIDE])
+        return c1, c2
+
+    def pairs(self) -> List[Tuple[Cubic, Cubic]]:
+        """The matched pairs as Cubic objects (a copy, built on demand)."""
+        return [self.pair(i) for i in range(self.pair_count)]
+
+    def as_cubics(self, progress: float) -> List[Cubic]:
+        """Same as Morph.as_cubics on the pairs, read straight from shared memory."""
+        v = self.coords
+        values = []
+        for base in range(0, len(v), PAIR_STRIDE):
+            for i in range(base, base + 8):
+                a = v[i]
+                values.append(a + (v[i + 8] - a) * progress)
+
+        result = Cubic.from_coords(values)
+        if not result:
+            return []
+
+        # close the shape: last cubic's end point snaps to first cubic's start
+        last = result[-1]
+        result[-1] = Cubic(last.p0, last.p1, last.p2, result[0].p0)
+        return result
+
+    def close(self):
+        self.coords.release()
+        self._buf.release()
+        self._shm.close()
+
+    def __enter__(self) -> "SharedMorph":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedMorphStore:
+    """
+    Publishes matched pairs into shared memory, one segment per unique morph, so
+    worker processes attach to a single copy instead of unpickling their own.
+
+    Morphs are deduplicated by key: the caller's (e.g. MorphCache.key of the two
+    polygons) or, by default, a hash of the pair coordinates. The store owns the
+    segments and unlinks them on close; keep it open while workers use them.
+    """
+
+    def __init__(self):
+        self._segments: Dict[
+            object, Tuple[shared_memory.SharedMemory, SharedMorphDescriptor]
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @property
+    def nbytes(self) -> int:
+        """Shared memory held by the published morphs."""
+        return sum(d.pair_count * PAIR_STRIDE * 8 for _, d in self._segments.values())
+
+    def publish(
+        self, matched_pairs: Sequence[Tuple[Cubic, Cubic]], key: Optional[object] = None
+    ) -> SharedMorphDescriptor:
+        coords = pairs_to_coords(matched_pairs)
+        if key is None:
+            key = hashlib.sha1(coords.tobytes()).hexdigest()
+
+        existing = self._segments.get(key)
+        if existing is not None:
+            return existing[1]
+
+        data = coords.tobytes()
+        # zero-size segments are not allowed
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+
+        descriptor = SharedMorphDescriptor(shm.name, len(matched_pairs))
+        self._segments[key] = (shm, descriptor)
+        return descriptor
+
+    def close(self):
+        for shm, _ in self._segments.values():
+            shm.close()
+            shm.unlink()
+        self._segments.clear()
+
+    def __enter__(self) -> "SharedMorphStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
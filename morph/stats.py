@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# phases of Morph.match, in order
+PHASES = ("measure", "distance_matrix", "mapping", "cut_and_shift", "walk")
+
+
+@dataclass
+class MatchStats:
+    """
+    Per-phase wall time and work counters of one Morph.match, filled in when
+    passed as `stats=`. Without it match does none of this bookkeeping.
+
+    Attributes:
+        label:             Free-form name for the match (e.g. "heart -> boom").
+        spans:             (phase, start, end) in time.perf_counter() seconds.
+        cubics_measured:   Cubics in both measured polygons.
+        anchors:           Corner pairs the mapping kept.
+        rejected_mappings: Candidate corner pairs the mapping turned down.
+        cuts:              Cubics cut during the walk (both sides).
+        pairs:             Matched pairs emitted.
+    """
+
+    label: str = ""
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)
+    cubics_measured: int = 0
+    anchors: int = 0
+    rejected_mappings: int = 0
+    cuts: int = 0
+    pairs: int = 0
+    thread_id: int = field(default_factory=threading.get_ident)
+
+    def record(self, phase: str, start: float) -> float:
+        """Closes the span of `phase` begun at `start`; returns the end time."""
+        end = time.perf_counter()
+        self.spans.append((phase, start, end))
+        return end
+
+    @property
+    def phase_ms(self) -> Dict[str, float]:
+        """Total milliseconds per phase, in phase order."""
+        totals = {phase: 0.0 for phase in PHASES}
+        for phase, start, end in self.spans:
+            totals[phase] = totals.get(phase, 0.0) + (end - start) * 1000
+        return totals
+
+    @property
+    def total_ms(self) -> float:
+        if not self.spans:
+            return 0.0
+        return (self.spans[-1][2] - self.spans[0][1]) * 1000
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            "cubics_measured": self.cubics_measured,
+            "anchors": self.anchors,
+            "rejected_mappings": self.rejected_mappings,
+            "cuts": self.cuts,
+            "pairs": self.pairs,
+        }
+
+
+def chrome_trace_events(
+    stats: Iterable[MatchStats], origin: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Chrome trace-event records ("X" complete events, microseconds) for the given
+    matches: one event per match with its counters as args, and one per phase
+    nested under it. Open the JSON in chrome://tracing or Perfetto.
+    """
+    stats = [s for s in stats if s.spans]
+    if not stats:
+        return []
+    if origin is None:
+        origin = min(s.spans[0][1] for s in stats)
+
+    def us(t: float) -> float:
+        return (t - origin) * 1e6
+
+    pid = os.getpid()
+    events = []
+    for s in stats:
+        start, end = s.spans[0][1], s.spans[-1][2]
+        events.append(
+            {
+                "name": s.label or "Morph.match",
+                "cat": "match",
+                "ph": "X",
+                "ts": us(start),
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": s.counters(),
+            }
+        )
+        for phase, phase_start, phase_end in s.spans:
+            events.append(
+                {
+                    "name": phase,
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": us(phase_start),
+                    "dur": (phase_end - phase_start) * 1e6,
+                    "pid": pid,
+                    "tid": s.thread_id,
+                }
+            )
+    return events
+
+
+def write_chrome_trace(path: str, stats: Iterable[MatchStats]):
+    with open(path, "w") as f:
+        json.dump({"traceEvents": chrome_trace_events(stats)}, f)
+
+
+# Called with the MatchStats of every Morph.match while set, see set_stats_hook
+stats_hook: Optional[Callable[[MatchStats], None]] = None
+
+
+def set_stats_hook(
+    hook: Optional[Callable[[MatchStats], None]],
+) -> Optional[Callable[[MatchStats], None]]:
+    """
+    Makes every Morph.match record a MatchStats and pass it to `hook` (from the
+    thread that ran the match). Returns the previous hook; None turns it off.
+    """
+    global stats_hook
+    previous = stats_hook
+    stats_hook = hook
+    return previous
+
+
+class ChromeTraceRecorder:
+    """
+    A stats hook that keeps every match's stats, for export as one Chrome trace:
+
+        recorder = ChromeTraceRecorder()
+        set_stats_hook(recorder)
+        ...
+        recorder.write("matches.json")
+    """
+
+    def __init__(self):
+        self.stats: List[MatchStats] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, stats: MatchStats):
+        with self._lock:
+            self.stats.append(stats)
+
+    def write(self, path: str):
+        with self._lock:
+            write_chrome_trace(path, list(self.stats))
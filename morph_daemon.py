@@ -0,0 +1,338 @@
+"""
+Local morph render daemon.
+
+Keeps the preset polygons and their matches in memory and serves morph frames
+over a Unix domain socket, so CLI tools, preview services and widgets share one
+warm cache instead of each re-creating polygons and matches.
+
+Protocol: newline-delimited JSON over one long-lived connection. Every request
+carries an "id" that is echoed in its response. Requests are handled
+concurrently, so a client may send many before reading any responses
+(pipelining), and responses may arrive out of order.
+
+    {"id": 1, "op": "frame", "start": "circle", "end": "heart",
+     "progress": 0.5, "format": "svg", "size": 500}
+    -> {"id": 1, "ok": true, "result": "M 250.0 50.0 C ... Z"}
+
+Ops:
+    frame    Shape at `progress` between `start` and `end`. Shapes are preset
+             names or {"vertices": [...], "per_vertex_rounding": [[r, s], ...]}
+             in unit coordinates. Formats:
+               cubics  [[p0x, p0y, p1x, p1y, p2x, p2y, p3x, p3y], ...]
+               svg     SVG path data
+               png     base64 PNG bytes (needs pycairo)
+    presets  Names of the available presets.
+    stats    AsyncMorphService metrics and cache size.
+    ping     Returns "pong".
+
+Usage (from the repository root):
+    python morph_daemon.py serve [--socket PATH] [--warm]
+    python morph_daemon.py frame circle heart 0.5 [--format svg] [--socket PATH]
+"""
+
+import os
+import sys
+import json
+import base64
+import socket
+import stat
+import asyncio
+import argparse
+import dataclasses
+import threading
+from typing import Any, Dict, Iterable, List
+
+from geometry.bezier_geometry import Cubic
+from geometry.corner_rounding import CornerRounding
+from geometry.rounded_polygon import RoundedPolygon
+from morph.bezier_morph import Morph
+from morph.cache import MorphCache, all_transitions, warm_up
+from morph.service import AsyncMorphService
+from shapes import preset_registry
+
+# Coordinates of served shapes, before scaling to the requested size
+BASE_SIZE = preset_registry.DEFAULT_SIZE
+BASE_MARGIN = preset_registry.DEFAULT_MARGIN
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "cairo-shapes.sock")
+    return f"/tmp/cairo-shapes-{os.getuid()}.sock"
+
+
+def svg_path(cubics: List[Cubic]) -> str:
+    if not cubics:
+        return ""
+    parts = [f"M {cubics[0].p0.x:.3f} {cubics[0].p0.y:.3f}"]
+    for c in cubics:
+        parts.append(
+            f"C {c.p1.x:.3f} {c.p1.y:.3f} {c.p2.x:.3f} {c.p2.y:.3f} "
+            f"{c.p3.x:.3f} {c.p3.y:.3f}"
+        )
+    parts.append("Z")
+    return " ".join(parts)
+
+
+def png_bytes(cubics: List[Cubic], size: int) -> bytes:
+    import io
+    import cairo
+
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+    ctx = cairo.Context(surface)
+    if cubics:
+        ctx.move_to(cubics[0].p0.x, cubics[0].p0.y)
+        for c in cubics:
+            ctx.curve_to(c.p1.x, c.p1.y, c.p2.x, c.p2.y, c.p3.x, c.p3.y)
+        ctx.close_path()
+        ctx.set_source_rgb(0.24, 0.52, 0.93)
+        ctx.fill()
+
+    buffer = io.BytesIO()
+    surface.write_to_png(buffer)
+    return buffer.getvalue()
+
+
+class MorphDaemon:
+    """
+    Request handling for the daemon: owns the morph cache and the
+    AsyncMorphService that fills it. Preset polygons come from the preset
+    registry, which builds each one on first use.
+    """
+
+    def __init__(self):
+        self.cache = MorphCache()
+        self.service = AsyncMorphService(cache=self.cache)
+
+    def warm_up_presets(self):
+        """Matches every preset pair into the cache, from a background thread."""
+        polygons = [preset_registry.polygon(name) for name in preset_registry.names()]
+        threading.Thread(
+            target=warm_up,
+            args=(self.cache, all_transitions(polygons)),
+            daemon=True,
+        ).start()
+
+    def _shape(self, value) -> RoundedPolygon:
+        if isinstance(value, str):
+            if value not in preset_registry.names():
+                raise ValueError(f"Unknown preset: {value}")
+            return preset_registry.polygon(value)
+        if isinstance(value, dict):
+            vertices = value["vertices"]
+            roundings = value.get("per_vertex_rounding") or [[0.0, 0.0]] * (
+                len(vertices) // 2
+            )
+            unit_data = [
+                ((vertices[i], vertices[i + 1]), CornerRounding(*roundings[i // 2]))
+                for i in range(0, len(vertices), 2)
+            ]
+            return RoundedPolygon.from_unit_data(unit_data, BASE_SIZE, BASE_MARGIN)
+        raise ValueError("A shape is a preset name or a vertices/rounding object")
+
+    async def handle(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "presets":
+            return sorted(preset_registry.names())
+        if op == "stats":
+            stats = dataclasses.asdict(self.service.metrics)
+            stats["cached_morphs"] = len(self.cache)
+            return stats
+        if op == "frame":
+            return await self._frame(request)
+        raise ValueError(f"Unknown op: {op}")
+
+    async def _frame(self, request: Dict[str, Any]) -> Any:
+        start = self._shape(request["start"])
+        end = self._shape(request["end"])
+        progress = float(request.get("progress", 0.0))
+        size = int(request.get("size", BASE_SIZE))
+        fmt = request.get("format", "cubics")
+
+        pairs = await self.service.match(start, end)
+
+        scale = size / BASE_SIZE
+        coords = [v * scale for v in Cubic.to_coords(Morph.as_cubics(pairs, progress))]
+
+        if fmt == "cubics":
+            return [coords[i : i + 8] for i in range(0, len(coords), 8)]
+
+        cubics = Cubic.from_coords(coords)
+        if fmt == "svg":
+            return svg_path(cubics)
+        if fmt == "png":
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, png_bytes, cubics, size)
+            return base64.b64encode(data).decode("ascii")
+        raise ValueError(f"Unknown format: {fmt}")
+
+    async def serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        pending = set()
+
+        async def respond(line: bytes):
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                result = await self.handle(request)
+                response = {"id": request_id, "ok": True, "result": result}
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                response = {"id": request_id, "ok": False, "error": error}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def serve(self, path: str):
+        _claim_socket_path(path)
+        server = await asyncio.start_unix_server(self.serve_connection, path=path)
+        print(f"Serving morphs on {path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.service.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def _claim_socket_path(path: str):
+    """
+    Removes a stale socket left at `path` by a daemon that is gone. Refuses to
+    touch a path that isn't a socket or that a running daemon still answers on.
+    """
+    if not os.path.exists(path):
+        return
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise RuntimeError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Another daemon is already serving on {path}")
+
+
+class MorphClient:
+    """
+    Blocking client for the daemon. One connection is reused for every call;
+    `request_many` pipelines a batch and returns the results in request order.
+    """
+
+    def __init__(self, path: str = None):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path or default_socket_path())
+        self._file = self._sock.makefile("rb")
+        self._next_id = 0
+
+    def request(self, **request) -> Any:
+        return self.request_many([request])[0]
+
+    def request_many(self, requests: Iterable[Dict[str, Any]]) -> List[Any]:
+        ids = []
+        payload = b""
+        for request in requests:
+            self._next_id += 1
+            ids.append(self._next_id)
+            payload += json.dumps({**request, "id": self._next_id}).encode() + b"\n"
+        self._sock.sendall(payload)
+
+        responses = {}
+        while len(responses) < len(ids):
+            line = self._file.readline()
+            if not line:
+                raise ConnectionError("Daemon closed the connection")
+            response = json.loads(line)
+            responses[response["id"]] = response
+
+        results = []
+        for request_id in ids:
+            response = responses[request_id]
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+            results.append(response["result"])
+        return results
+
+    def frame(
+        self, start, end, progress: float, format: str = "cubics", size: int = BASE_SIZE
+    ):
+        return self.request(
+            op="frame", start=start, end=end, progress=progress, format=format, size=size
+        )
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "MorphClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    # --socket is accepted after the command too, as in the usage above
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", default=default_socket_path())
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", parents=[common], help="run the daemon")
+    serve_parser.add_argument(
+        "--warm", action="store_true", help="match all preset pairs up front"
+    )
+
+    frame_parser = commands.add_parser(
+        "frame", parents=[common], help="request one frame"
+    )
+    frame_parser.add_argument("start")
+    frame_parser.add_argument("end")
+    frame_parser.add_argument("progress", type=float)
+    frame_parser.add_argument("--format", choices=["cubics", "svg", "png"], default="svg")
+    frame_parser.add_argument("--size", type=int, default=BASE_SIZE)
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        daemon = MorphDaemon()
+        if args.warm:
+            daemon.warm_up_presets()
+        try:
+            asyncio.run(daemon.serve(args.socket))
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as e:
+            sys.exit(str(e))
+    else:
+        with MorphClient(args.socket) as client:
+            result = client.frame(
+                args.start, args.end, args.progress, args.format, args.size
+            )
+        if args.format == "png":
+            sys.stdout.buffer.write(base64.b64decode(result))
+        else:
+            print(result if isinstance(result, str) else json.dumps(result))
@@ -1,6 +1,26 @@
-from .square import Square
-from .triangle import Triangle
-from .linear_morph_shape import ShapeMorph
-from .bezier_morph_shape import BezierShapeMorph, AnimateShapeMorph
+# Widgets import gi (Gtk 3.0) and cairo, so they are only loaded when accessed.
+# `shapes.shape_presets` and `shapes.preset_registry` stay importable headless.
+import importlib
+
+_WIDGETS = {
+    "Square": ".square",
+    "Triangle": ".triangle",
+    "ShapeMorph": ".linear_morph_shape",
+    "BezierShapeMorph": ".bezier_morph_shape",
+    "AnimateShapeMorph": ".bezier_morph_shape",
+}
 
 __all__ = ["Square", "Triangle", "ShapeMorph", "BezierShapeMorph", "AnimateShapeMorph"]
+
+
+def __getattr__(name):
+    module = _WIDGETS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_WIDGETS))
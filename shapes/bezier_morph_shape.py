@@ -1,47 +1,14 @@
 import cairo
 import threading
+from typing import Dict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from morph.bezier_morph import Morph
+from morph.cache import MorphCache, cycle_transitions, warm_up
+from geometry import tracing
 from geometry.rounded_polygon import RoundedPolygon
-from .shape_presets import (
-    star,
-    clover_flower,
-    organic_blob,
-    puffy_square,
-    pill,
-    shield,
-    concave_rectangle,
-    cookie_12,
-    cookie_8,
-    fan,
-    apple,
-    t_apple,
-    t_fan,
-    arrow,
-    circle,
-    square,
-    slanted,
-    arch,
-    semicircle,
-    oval,
-    pill_tilted,
-    triangle,
-    diamond,
-    clamshell,
-    pentagon,
-    gem,
-    very_sunny,
-    sunny,
-    four_leaf_clover,
-    puffy_diamond,
-    ghost_ish,
-    pixel_triangle,
-    bun,
-    heart,
-    pixel_circle,
-    boom,
-    puffy_diamond,
-)
+from . import preset_registry
+from .shape_presets import diamond, fan
 
 import gi
 
@@ -54,8 +21,8 @@ class BezierShapeMorph(Gtk.DrawingArea):
         super().__init__()
         self.set_size_request(1000, 1000)
 
-        poly_start = self.create_rounded_polygon(diamond)
-        poly_end = self.create_rounded_polygon(fan)
+        poly_start = RoundedPolygon.from_unit_data(diamond)
+        poly_end = RoundedPolygon.from_unit_data(fan)
 
         print(" = = =  = =  this i what you wnat")
         from pprint import pprint
@@ -174,49 +141,38 @@ class BezierShapeMorph(Gtk.DrawingArea):
 
         return False
 
-    def create_rounded_polygon(self, unit_data, size=500, margin=0):
-        draw_area = size - (margin * 2)
-        verts = []
-        per_vertex = []
-        for (ux, uy), rounding_preset in unit_data:
-            sx = margin + (ux * draw_area)
-            sy = margin + (uy * draw_area)
-            verts.extend([sx, sy])
-            per_vertex.append(rounding_preset)
-
-        return RoundedPolygon.create(vertices=verts, per_vertex_rounding=per_vertex)
-
 
 class AnimateShapeMorph(Gtk.DrawingArea):
-    def __init__(self):
+    def __init__(self, warm_up=False):
         super().__init__()
         self.set_size_request(750, 750)
 
+        # preset names, polygons come from the preset registry
         self.presets = [
-            circle,
-            square,
-            slanted,
-            arch,
-            semicircle,
-            oval,
-            pill,
-            triangle,
-            arrow,
-            diamond,
-            clamshell,
-            pentagon,
-            gem,
-            cookie_8,
-            shield,
-            four_leaf_clover,
-            boom,
-            puffy_diamond,
-            concave_rectangle,
-            ghost_ish,
-            pixel_circle,
-            pixel_triangle,
-            bun,
-            heart,
+            "circle",
+            "square",
+            "slanted",
+            "arch",
+            "semicircle",
+            "oval",
+            "pill",
+            "triangle",
+            "arrow",
+            "diamond",
+            "clamshell",
+            "pentagon",
+            "gem",
+            "cookie_8",
+            "shield",
+            "four_leaf_clover",
+            "boom",
+            "puffy_diamond",
+            "concave_rectangle",
+            "ghost_ish",
+            "pixel_circle",
+            "pixel_triangle",
+            "bun",
+            "heart",
         ]
         self.current_idx = 0
 
@@ -225,19 +181,66 @@ class AnimateShapeMorph(Gtk.DrawingArea):
         self.pause_frames = 20
         self.pause_counter = 0
 
-        self._prepare_next_morph()
+        # Morphs are matched on a worker thread ahead of time and only swapped in
+        # from the main loop once done, so a frame never waits on Morph.match.
+        # Keyed by the index of the transition's start preset.
+        self.mappings = None
+        self.morph_cache = MorphCache()
+        self._morph_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="morph-prepare"
+        )
+        self._morph_futures: Dict[int, Future] = {}
+        self._schedule_morphs()
+
+        # optionally match the whole cycle up front on a process pool
+        if warm_up:
+            threading.Thread(target=self._warm_up, daemon=True).start()
 
         self.connect("draw", self.on_draw)
+        self.connect("destroy", self._on_destroy)
         GLib.timeout_add(16, self.update_animation)  # ~60 fps
         self.show_all()
 
-    def _prepare_next_morph(self):
-        next_idx = (self.current_idx + 1) % len(self.presets)
+    def _schedule_morphs(self):
+        """Queues the next and next-but-one transitions (and the first at startup)."""
+        first = 0 if self.mappings is None else 1
+        for k in range(first, 3):
+            idx = (self.current_idx + k) % len(self.presets)
+            if idx not in self._morph_futures:
+                self._morph_futures[idx] = self._morph_executor.submit(
+                    self._compute_morph,
+                    self.morph_cache,
+                    self.presets[idx],
+                    self.presets[(idx + 1) % len(self.presets)],
+                )
+
+    def _take_ready_morph(self, idx):
+        """The matched pairs for transition idx if the worker has finished them."""
+        future = self._morph_futures.get(idx)
+        if future is None or not future.done():
+            return None
+        del self._morph_futures[idx]
+        return future.result()
 
-        poly_start = self.create_rounded_polygon(self.presets[self.current_idx])
-        poly_end = self.create_rounded_polygon(self.presets[next_idx])
+    @staticmethod
+    def _compute_morph(cache, start_name, end_name):
+        # runs on the worker thread
+        poly_start = preset_registry.polygon(start_name)
+        poly_end = preset_registry.polygon(end_name)
+        return cache.get_or_match(poly_start, poly_end)
 
-        self.mappings = Morph.match(poly_start, poly_end)
+    def _warm_up(self):
+        # runs on its own thread, results land in morph_cache as they complete
+        polygons = [preset_registry.polygon(name) for name in self.presets]
+
+        def report(done, total):
+            if done == total and tracing.info_on:
+                tracing.emit("morph.warm_up_done", tracing.INFO, transitions=total)
+
+        warm_up(self.morph_cache, cycle_transitions(polygons), on_progress=report)
+
+    def _on_destroy(self, *args):
+        self._morph_executor.shutdown(wait=False, cancel_futures=True)
 
     @staticmethod
     def _cubic_bezier(x1, y1, x2, y2):
@@ -294,6 +297,14 @@ class AnimateShapeMorph(Gtk.DrawingArea):
             return 0.2 + self._m3_ease_out((t - 0.4) / 0.6) * 0.8
 
     def update_animation(self):
+        # first morph still being matched
+        if self.mappings is None:
+            self.mappings = self._take_ready_morph(self.current_idx)
+            if self.mappings is None:
+                return True
+            self._schedule_morphs()
+            self.queue_draw()
+
         # handle the pause between shapes
         if self.pause_counter > 0:
             self.pause_counter -= 1
@@ -302,10 +313,18 @@ class AnimateShapeMorph(Gtk.DrawingArea):
         self.progress += self.animation_speed
 
         if self.progress >= 1.0:
-            self.progress = 0.0
-            self.current_idx = (self.current_idx + 1) % len(self.presets)
-            self.pause_counter = self.pause_frames
-            self._prepare_next_morph()
+            next_idx = (self.current_idx + 1) % len(self.presets)
+            next_mappings = self._take_ready_morph(next_idx)
+
+            if next_mappings is None:
+                # next morph not matched yet, hold the finished shape
+                self.progress = 1.0
+            else:
+                self.progress = 0.0
+                self.current_idx = next_idx
+                self.mappings = next_mappings
+                self.pause_counter = self.pause_frames
+                self._schedule_morphs()
 
         self.queue_draw()
         return True
@@ -319,6 +338,9 @@ class AnimateShapeMorph(Gtk.DrawingArea):
         scale_factor = side / 500.0
         ctx.scale(scale_factor, scale_factor)
 
+        if self.mappings is None:
+            return False
+
         alpha = self.material_easing(self.progress)
 
         curves = Morph.as_cubics(self.mappings, alpha)
@@ -339,15 +361,3 @@ class AnimateShapeMorph(Gtk.DrawingArea):
         ctx.fill()
 
         return False
-
-    def create_rounded_polygon(self, unit_data, size=500, margin=50):
-        draw_area = size - (margin * 2)
-        verts = []
-        per_vertex = []
-        for (ux, uy), rounding_preset in unit_data:
-            sx = margin + (ux * draw_area)
-            sy = margin + (uy * draw_area)
-            verts.extend([sx, sy])
-            per_vertex.append(rounding_preset)
-
-        return RoundedPolygon.create(vertices=verts, per_vertex_rounding=per_vertex)
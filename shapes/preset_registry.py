@@ -0,0 +1,201 @@
+"""
+Registry of the presets in shapes/shape_presets.py as ready-made RoundedPolygons.
+
+Polygons are built on first use and cached, so presets that are never asked
+for cost nothing. Module attribute access is a shortcut for the default size:
+
+    from shapes import preset_registry
+    preset_registry.heart                    # RoundedPolygon, 500 x 500, margin 50
+    preset_registry.polygon("heart", 1000)   # any other size / margin
+
+At the default size, polygons come from the compiled library (presets.bin next
+to this file) when it exists and is up to date with shape_presets.py, the
+geometry code that rounds the corners and the binary format version. Loading
+one preset from it reads only that preset's record instead of rounding every
+corner again. Build it with:
+
+    python -m shapes.preset_registry
+"""
+
+import hashlib
+import mmap
+import struct
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from geometry import bezier_geometry, corner_rounding, rounded_polygon
+from geometry.corner_rounding import CornerRounding
+from geometry.rounded_polygon import RoundedPolygon
+from morph import serialization
+from morph.serialization import dump_polygon, load_polygon
+from . import shape_presets
+
+UnitData = List[Tuple[Tuple[float, float], CornerRounding]]
+
+# geometry used by AnimateShapeMorph, the benchmarks and the daemon
+DEFAULT_SIZE = 500
+DEFAULT_MARGIN = 50
+
+LIBRARY_PATH = Path(__file__).with_name("presets.bin")
+# the library is stale when any of these change: the presets and the code that
+# turns them into cubics
+SOURCE_PATHS = tuple(
+    Path(module.__file__)
+    for module in (shape_presets, rounded_polygon, corner_rounding, bezier_geometry)
+)
+
+# magic, version, source digest, size, margin, preset count
+_LIBRARY_HEADER = struct.Struct("<4sH2x20sddI4x")
+_LIBRARY_MAGIC = b"CSPL"
+_LIBRARY_VERSION = 1
+# name length, record offset, record length (the name follows)
+_INDEX_ENTRY = struct.Struct("<HII")
+
+
+@lru_cache(maxsize=None)
+def _names() -> Tuple[str, ...]:
+    return tuple(
+        name
+        for name, value in vars(shape_presets).items()
+        if isinstance(value, list)
+        and value
+        and isinstance(value[0], tuple)
+        and isinstance(value[0][1], CornerRounding)
+    )
+
+
+def names() -> List[str]:
+    """Every preset defined in shapes/shape_presets.py."""
+    return list(_names())
+
+
+def unit_data(name: str) -> UnitData:
+    if name not in _names():
+        raise KeyError(f"Unknown preset: {name}")
+    return getattr(shape_presets, name)
+
+
+@lru_cache(maxsize=None)
+def polygon(
+    name: str, size: float = DEFAULT_SIZE, margin: float = DEFAULT_MARGIN
+) -> RoundedPolygon:
+    """The preset placed in a size x size area, built once per (name, size, margin)."""
+    if size == DEFAULT_SIZE and margin == DEFAULT_MARGIN:
+        records = _library()
+        if records is not None and name in records:
+            return load_polygon(records[name])
+    return RoundedPolygon.from_unit_data(unit_data(name), size, margin)
+
+
+def _source_digest(size: float, margin: float) -> bytes:
+    digest = hashlib.sha1()
+    for path in SOURCE_PATHS:
+        digest.update(path.read_bytes())
+    digest.update(struct.pack("<ddH", size, margin, serialization.VERSION))
+    return digest.digest()
+
+
+_library_lock = threading.Lock()
+_library_records: Optional[Dict[str, memoryview]] = None
+_library_loaded = False
+
+
+def _library() -> Optional[Dict[str, memoryview]]:
+    """Preset records of the compiled library, or None if it is missing or stale."""
+    global _library_records, _library_loaded
+    with _library_lock:
+        if not _library_loaded:
+            _library_loaded = True
+            _library_records = _read_library(LIBRARY_PATH)
+        return _library_records
+
+
+def _read_library(path: Path) -> Optional[Dict[str, memoryview]]:
+    if not path.exists():
+        return None
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    magic, version, digest, size, margin, count = _LIBRARY_HEADER.unpack_from(view, 0)
+    if (
+        magic != _LIBRARY_MAGIC
+        or version != _LIBRARY_VERSION
+        or (size, margin) != (DEFAULT_SIZE, DEFAULT_MARGIN)
+        or digest != _source_digest(size, margin)
+    ):
+        view.release()
+        mapped.close()
+        return None
+
+    # the mapping stays open for the life of the process, records are views into it
+    records = {}
+    pos = _LIBRARY_HEADER.size
+    for _ in range(count):
+        name_length, offset, length = _INDEX_ENTRY.unpack_from(view, pos)
+        pos += _INDEX_ENTRY.size
+        name = bytes(view[pos : pos + name_length]).decode()
+        pos += name_length
+        records[name] = view[offset : offset + length]
+    return records
+
+
+def compile_library(path: Path = LIBRARY_PATH) -> int:
+    """
+    Writes every preset at the default size to `path` in the binary polygon
+    format (see morph/serialization.py), behind a name index. Returns the
+    number of presets written.
+    """
+    preset_names = names()
+    blobs = [
+        dump_polygon(
+            RoundedPolygon.from_unit_data(unit_data(n), DEFAULT_SIZE, DEFAULT_MARGIN)
+        )
+        for n in preset_names
+    ]
+    encoded = [n.encode() for n in preset_names]
+
+    index_size = sum(_INDEX_ENTRY.size + len(n) for n in encoded)
+    offset = _LIBRARY_HEADER.size + index_size
+
+    index = []
+    offsets = []
+    for name, blob in zip(encoded, blobs):
+        offset += -offset % 8  # records start 8-byte aligned for the float64 views
+        offsets.append(offset)
+        index.append(_INDEX_ENTRY.pack(len(name), offset, len(blob)) + name)
+        offset += len(blob)
+
+    header = _LIBRARY_HEADER.pack(
+        _LIBRARY_MAGIC,
+        _LIBRARY_VERSION,
+        _source_digest(DEFAULT_SIZE, DEFAULT_MARGIN),
+        DEFAULT_SIZE,
+        DEFAULT_MARGIN,
+        len(blobs),
+    )
+    data = bytearray(header + b"".join(index))
+    for record_offset, blob in zip(offsets, blobs):
+        data.extend(b"\0" * (record_offset - len(data)))
+        data.extend(blob)
+
+    path.write_bytes(bytes(data))
+    return len(blobs)
+
+
+def __getattr__(name: str) -> RoundedPolygon:
+    if name.startswith("_") or name not in _names():
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return polygon(name)
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + names())
+
+
+if __name__ == "__main__":
+    count = compile_library()
+    print(f"Compiled {count} presets to {LIBRARY_PATH}")
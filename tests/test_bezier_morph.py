@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks import synthetic
+from geometry.bezier_geometry import Cubic
+from geometry.rounded_polygon import RoundedPolygon
+from morph.bezier_morph import Morph
+from shapes import preset_registry
+
+
+def polygon(name: str, nudge: float = 0.0) -> RoundedPolygon:
+    """A preset, with every vertex moved by up to `nudge` (unit square) if given."""
+    data = [
+        ((x + nudge * ((i % 3) - 1), y + nudge * ((i % 2) * 2 - 1)), rounding)
+        for i, ((x, y), rounding) in enumerate(preset_registry.unit_data(name))
+    ]
+    return RoundedPolygon.from_unit_data(data, 500, 50)
+
+
+def coords(pairs):
+    return Cubic.to_coords([c for pair in pairs for c in pair])
+
+
+@pytest.mark.parametrize("names", [("square", "heart"), ("cookie_8", "pentagon")])
+def test_rematch_of_unchanged_shapes_is_match(names):
+    poly1, poly2 = (polygon(n) for n in names)
+    pairs = Morph.match(poly1, poly2)
+
+    rematched = Morph.rematch(pairs.plan, poly1, poly2)
+    assert rematched.plan == pairs.plan
+    assert coords(rematched) == pytest.approx(coords(pairs))
+
+
+# pairs without mirror-image ties, where any edit could flip the best anchors
+@pytest.mark.parametrize("names", [("triangle", "arrow"), ("cookie_8", "pentagon")])
+def test_rematch_of_edited_shapes_reuses_the_plan(names):
+    plan = Morph.match(*(polygon(n) for n in names)).plan
+    edited1, edited2 = (polygon(n, nudge=0.01) for n in names)
+
+    rematched = Morph.rematch(plan, edited1, edited2)
+    matched = Morph.match(edited1, edited2)
+    # small edits don't change which corners a full match pairs up
+    assert matched.plan == plan
+    assert rematched.plan == plan
+    assert coords(rematched) == pytest.approx(coords(matched))
+
+
+def test_rematch_falls_back_to_match():
+    circle, square, triangle = polygon("circle"), polygon("square"), polygon("triangle")
+    plan = Morph.match(square, circle).plan
+
+    for reused in (None, plan):
+        pairs = Morph.rematch(reused, triangle, circle)
+        expected = Morph.match(triangle, circle)
+        assert pairs.plan == expected.plan
+        assert coords(pairs) == pytest.approx(coords(expected))
+
+
+def test_reversed_view_swaps_pairs():
+    pairs = Morph.match(polygon("pentagon"), polygon("heart"))
+    view = pairs.reversed()
+
+    assert len(view) == len(pairs)
+    assert list(view) == [(c2, c1) for c1, c2 in pairs]
+    assert view[1] == (pairs[1][1], pairs[1][0])
+    assert view[-2:] == [(c2, c1) for c1, c2 in pairs[-2:]]
+    assert view.reversed() is pairs
+    assert view.plan == pairs.plan.swapped()
+
+
+def test_reversed_view_plays_the_morph_backwards():
+    pairs = Morph.match(polygon("pentagon"), polygon("heart"))
+    view = pairs.reversed()
+
+    for t in (0.0, 0.3, 1.0):
+        backwards = Morph.as_cubics(view, t)
+        assert Cubic.to_coords(backwards) == pytest.approx(
+            Cubic.to_coords(Morph.as_cubics(pairs, 1 - t))
+        )
+
+
+def test_reversed_plan_rematches_the_other_way():
+    pentagon, heart = polygon("pentagon"), polygon("heart")
+    view = Morph.match(pentagon, heart).reversed()
+
+    pairs = Morph.rematch(view.plan, heart, pentagon)
+    assert pairs.plan == view.plan
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def test_match_on_executor_is_serial_match_on_presets(executor):
+    names = preset_registry.names()
+    for name1, name2 in zip(names, names[1:] + names[:1]):
+        poly1, poly2 = polygon(name1), polygon(name2)
+        assert coords(Morph.match(poly1, poly2, executor)) == coords(Morph.match(poly1, poly2))
+
+
+# includes walks whose mapped Shape 2 ends cross the 0/1 seam near the end
+@pytest.mark.parametrize(
+    "kind, n, seed1, seed2",
+    [("star", 400, 1, 1), ("comb", 300, 1, 11), ("star", 200, 0, 3), ("comb", 400, 2, 5)],
+)
+def test_match_on_executor_is_serial_match_on_large_outlines(executor, kind, n, seed1, seed2):
+    poly1 = synthetic.polygon(kind, n, seed1)
+    poly2 = synthetic.polygon(kind, n, seed2)
+    assert coords(Morph.match(poly1, poly2, executor)) == coords(Morph.match(poly1, poly2))
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+
+from geometry import tracing
+from geometry.bezier_geometry import Cubic
+from morph.bezier_morph import Morph
+from shapes import preset_registry
+
+WAIT_S = 5.0
+
+
+@pytest.fixture(scope="module")
+def shapes():
+    return {name: preset_registry.polygon(name) for name in ("square", "heart", "pentagon")}
+
+
+class GatedMatch:
+    """
+    Stands in for the exact Morph.match that a budgeted match refines with: it
+    waits for `gate`, then raises `error` or runs the real match. Budgeted calls
+    go to the real Morph.match.
+    """
+
+    def __init__(self, monkeypatch, error=None):
+        self.real = Morph.match
+        self.gate = threading.Event()
+        self.error = error
+        self.calls = []
+        monkeypatch.setattr(Morph, "match", staticmethod(self))
+
+    def __call__(self, poly1, poly2, executor=None, budget_ms=None, on_refined=None):
+        if budget_ms is not None:
+            return self.real(poly1, poly2, executor, budget_ms, on_refined)
+        self.calls.append((poly1, poly2))
+        assert self.gate.wait(WAIT_S)
+        if self.error is not None:
+            raise self.error
+        return self.real(poly1, poly2, executor)
+
+
+class Refined:
+    """on_refined callback that records what it is given."""
+
+    def __init__(self):
+        self.results = []
+        self.delivered = threading.Event()
+
+    def __call__(self, pairs):
+        self.results.append(pairs)
+        self.delivered.set()
+
+
+def coords(pairs):
+    return Cubic.to_coords([c for pair in pairs for c in pair])
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + WAIT_S
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_in_budget_returns_the_exact_match(monkeypatch, shapes):
+    exact = GatedMatch(monkeypatch)
+    exact.gate.set()
+    on_refined = Refined()
+
+    pairs = Morph.match(shapes["square"], shapes["heart"], budget_ms=5000, on_refined=on_refined)
+    assert pairs.plan is not None
+    assert coords(pairs) == coords(exact.real(shapes["square"], shapes["heart"]))
+    assert not on_refined.results
+
+
+def test_over_budget_returns_coarse_pairs_then_refines(monkeypatch, shapes):
+    exact = GatedMatch(monkeypatch)
+    on_refined = Refined()
+
+    pairs = Morph.match(shapes["square"], shapes["heart"], budget_ms=20, on_refined=on_refined)
+    assert pairs.plan is None
+    assert len(pairs) > 0
+    assert not on_refined.results
+
+    exact.gate.set()
+    assert on_refined.delivered.wait(WAIT_S)
+    (refined,) = on_refined.results
+    assert refined.plan is not None
+    assert coords(refined) == coords(exact.real(shapes["square"], shapes["heart"]))
+
+
+def test_newer_match_with_the_same_callback_supersedes(monkeypatch, shapes):
+    exact = GatedMatch(monkeypatch)
+    on_refined = Refined()
+
+    Morph.match(shapes["square"], shapes["heart"], budget_ms=20, on_refined=on_refined)
+    wait_for(lambda: len(exact.calls) == 1)
+    Morph.match(shapes["square"], shapes["pentagon"], budget_ms=20, on_refined=on_refined)
+
+    exact.gate.set()
+    assert on_refined.delivered.wait(WAIT_S)
+    # both refinements ran, only the newer one was delivered
+    wait_for(lambda: len(exact.calls) == 2)
+    (refined,) = on_refined.results
+    assert coords(refined) == coords(exact.real(shapes["square"], shapes["pentagon"]))
+
+
+def test_over_budget_without_callback_drops_the_refinement(monkeypatch, shapes):
+    exact = GatedMatch(monkeypatch)
+    on_refined = Refined()
+
+    # keeps the refiner busy so the next refinement is still queued
+    Morph.match(shapes["square"], shapes["heart"], budget_ms=20, on_refined=on_refined)
+    wait_for(lambda: len(exact.calls) == 1)
+    pairs = Morph.match(shapes["heart"], shapes["pentagon"], budget_ms=20)
+    assert pairs.plan is None
+
+    exact.gate.set()
+    assert on_refined.delivered.wait(WAIT_S)
+    # refinements run in order, so once this one is done the dropped one would have run
+    Morph.match(shapes["pentagon"], shapes["square"], budget_ms=5000)
+    assert [(p1, p2) for p1, p2 in exact.calls] == [
+        (shapes["square"], shapes["heart"]),
+        (shapes["pentagon"], shapes["square"]),
+    ]
+
+
+@pytest.mark.parametrize("within_budget", [True, False])
+def test_failed_refinement_is_reported_and_keeps_coarse_pairs(
+    monkeypatch, shapes, within_budget
+):
+    exact = GatedMatch(monkeypatch, error=ValueError("no match"))
+    on_refined = Refined()
+    budget_ms = 5000 if within_budget else 20
+
+    with tracing.capture(tracing.WARNING) as records:
+        if within_budget:
+            exact.gate.set()
+        pairs = Morph.match(
+            shapes["square"], shapes["heart"], budget_ms=budget_ms, on_refined=on_refined
+        )
+        exact.gate.set()
+        wait_for(lambda: any(r.event == "morph.refine_failed" for r in records))
+
+    assert pairs.plan is None
+    assert len(pairs) > 0
+    assert not on_refined.results
+    (record,) = [r for r in records if r.event == "morph.refine_failed"]
+    assert record.fields["error"] == "ValueError: no match"
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from geometry.bezier_geometry import Cubic
+from morph.bezier_morph import Morph
+from morph_daemon import MorphClient, MorphDaemon, _claim_socket_path, svg_path
+from shapes import preset_registry
+
+
+@pytest.fixture
+def daemon_path(tmp_path):
+    """Serves a fresh MorphDaemon from a background event loop, yields its socket path."""
+    path = str(tmp_path / "morph.sock")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    serving = asyncio.run_coroutine_threadsafe(MorphDaemon().serve(path), loop)
+
+    deadline = time.monotonic() + 5
+    while not (tmp_path / "morph.sock").exists():
+        assert not serving.done(), serving.exception()
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+
+    yield path
+
+    loop.call_soon_threadsafe(serving.cancel)
+    for _ in range(500):
+        if serving.done():
+            break
+        time.sleep(0.01)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def raw_exchange(path, requests):
+    """Sends newline-delimited requests at once, returns the responses as they arrive."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(b"".join(json.dumps(r).encode() + b"\n" for r in requests))
+        with sock.makefile("rb") as f:
+            return [json.loads(f.readline()) for _ in requests]
+
+
+def expected_cubics(start, end, progress, size=500):
+    pairs = Morph.match(preset_registry.polygon(start), preset_registry.polygon(end))
+    coords = Cubic.to_coords(Morph.as_cubics(pairs, progress))
+    scale = size / preset_registry.DEFAULT_SIZE
+    return [[v * scale for v in coords[i : i + 8]] for i in range(0, len(coords), 8)]
+
+
+def frame(start, end, progress, format, size=500):
+    return dict(op="frame", start=start, end=end, progress=progress, format=format, size=size)
+
+
+def test_pipelined_requests_return_in_request_order(daemon_path):
+    requests = [
+        frame("circle", "heart", 0.5, "cubics"),
+        {"op": "ping"},
+        frame("square", "pentagon", 0.25, "svg", size=250),
+        frame("circle", "heart", 0.5, "svg"),
+        {"op": "presets"},
+    ]
+    with MorphClient(daemon_path) as client:
+        cubics, pong, square_svg, heart_svg, presets = client.request_many(requests)
+
+    assert [len(c) for c in cubics] == [8] * len(cubics)
+    assert sum(cubics, []) == pytest.approx(sum(expected_cubics("circle", "heart", 0.5), []))
+    assert pong == "pong"
+    assert square_svg == svg_path(
+        Cubic.from_coords(sum(expected_cubics("square", "pentagon", 0.25, 250), []))
+    )
+    assert heart_svg == svg_path(Cubic.from_coords(sum(cubics, [])))
+    assert heart_svg.startswith("M ") and heart_svg.endswith(" Z")
+    assert presets == sorted(preset_registry.names())
+
+
+def test_responses_may_arrive_out_of_order(daemon_path):
+    responses = raw_exchange(
+        daemon_path,
+        [{"id": "slow", **frame("cookie_8", "heart", 0.5, "svg")}, {"id": "fast", "op": "ping"}],
+    )
+    # the match runs on an executor, the ping is answered while it does
+    assert [r["id"] for r in responses] == ["fast", "slow"]
+    assert all(r["ok"] for r in responses)
+
+
+def test_errors_answer_the_request_and_keep_the_connection(daemon_path):
+    responses = raw_exchange(
+        daemon_path,
+        [
+            {"id": 1, **frame("circle", "no_such_preset", 0.5, "svg")},
+            {"id": 2, "op": "explode"},
+            {"id": 3, **frame("circle", "heart", 0.5, "gif")},
+            {"id": 4, "op": "ping"},
+        ],
+    )
+    by_id = {r["id"]: r for r in responses}
+    assert not by_id[1]["ok"] and "no_such_preset" in by_id[1]["error"]
+    assert not by_id[2]["ok"] and "explode" in by_id[2]["error"]
+    assert not by_id[3]["ok"] and "gif" in by_id[3]["error"]
+    assert by_id[4] == {"id": 4, "ok": True, "result": "pong"}
+
+    with MorphClient(daemon_path) as client:
+        with pytest.raises(RuntimeError, match="Unknown op"):
+            client.request_many([{"op": "ping"}, {"op": "explode"}])
+        assert client.request(op="ping") == "pong"
+
+
+def test_claim_socket_path_removes_a_dead_socket(tmp_path):
+    path = str(tmp_path / "dead.sock")
+    _claim_socket_path(path)  # nothing there: nothing to do
+
+    dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    dead.bind(path)
+    dead.close()
+
+    _claim_socket_path(path)
+    assert not (tmp_path / "dead.sock").exists()
+
+
+def test_claim_socket_path_refuses_a_live_socket(tmp_path):
+    path = str(tmp_path / "live.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+        live.bind(path)
+        live.listen()
+        with pytest.raises(RuntimeError, match="already serving"):
+            _claim_socket_path(path)
+    assert (tmp_path / "live.sock").exists()
+
+
+def test_claim_socket_path_refuses_other_files(tmp_path):
+    path = tmp_path / "not-a-socket"
+    path.write_text("keep me")
+    with pytest.raises(RuntimeError, match="not a socket"):
+        _claim_socket_path(str(path))
+    assert path.read_text() == "keep me"
@@ -0,0 +1,97 @@
+import math
+
+import pytest
+
+from geometry.bezier_geometry import Cubic
+from morph.bezier_morph import Morph
+from shapes import preset_registry
+
+TRANSITIONS = [
+    ("circle", "cookie_12"),
+    ("square", "heart"),
+    ("pill", "triangle"),
+    ("four_leaf_clover", "boom"),
+    ("pixel_circle", "pixel_triangle"),
+]
+
+SAMPLES_PER_CUBIC = 64
+
+
+@pytest.fixture(scope="module", params=TRANSITIONS, ids="->".join)
+def pairs(request):
+    start, end = (preset_registry.polygon(name) for name in request.param)
+    return Morph.match(start, end)
+
+
+def samples(cubics):
+    return [c.point_at(i / SAMPLES_PER_CUBIC) for c in cubics for i in range(SAMPLES_PER_CUBIC + 1)]
+
+
+def segment_distance(p, a, b) -> float:
+    dx, dy = b.x - a.x, b.y - a.y
+    length_squared = dx * dx + dy * dy
+    t = 0.0
+    if length_squared > 0:
+        t = max(0.0, min(1.0, ((p.x - a.x) * dx + (p.y - a.y) * dy) / length_squared))
+    return math.hypot(p.x - a.x - t * dx, p.y - a.y - t * dy)
+
+
+def distance(points, outline) -> float:
+    """Furthest any of `points` lies from the polyline through `outline`."""
+    return max(
+        min(segment_distance(p, a, b) for a, b in zip(outline, outline[1:])) for p in points
+    )
+
+
+def runs(original, merged):
+    """Each merged cubic with the run of original cubics it replaces."""
+    # a merged cubic starts where the first cubic of its run does
+    starts = [i for i, c in enumerate(original) if any(c.p0 is m.p0 for m in merged)]
+    assert len(starts) == len(merged)
+    return zip(merged, (original[i:j] for i, j in zip(starts, starts[1:] + [len(original)])))
+
+
+def deviation(original, merged) -> float:
+    worst = 0.0
+    for cubic, run in runs(original, merged):
+        if run == [cubic]:
+            continue
+        merged_points, run_points = samples([cubic]), samples(run)
+        worst = max(worst, distance(merged_points, run_points), distance(run_points, merged_points))
+    return worst
+
+
+def max_gap(cubics) -> float:
+    return max(a.p3.dist_to(b.p0) for a, b in zip(cubics, cubics[1:]))
+
+
+@pytest.mark.parametrize("tolerance, scale", [(0.5, 1.0), (2.0, 1.0), (2.0, 4.0)])
+def test_merge_pairs_stays_within_tolerance(pairs, tolerance, scale):
+    merged = Morph.merge_pairs(pairs, tolerance, scale)
+    assert 0 < len(merged) <= len(pairs)
+
+    for side in (0, 1):
+        original = [pair[side] for pair in pairs]
+        result = [pair[side] for pair in merged]
+        assert max_gap(result) <= max_gap(original) + 1e-9
+        # the polyline through dense samples is within ~1e-3 of the curves
+        assert deviation(original, result) <= tolerance / scale + 1e-3
+
+
+def test_zero_tolerance_only_merges_exact_splits(pairs):
+    merged = Morph.merge_pairs(pairs, tolerance=0.0)
+    for side in (0, 1):
+        original = [pair[side] for pair in pairs]
+        assert deviation(original, [pair[side] for pair in merged]) <= 1e-9
+
+
+def test_zero_tolerance_merges_a_split_back():
+    cubic = Cubic.from_coords([0.0, 0.0, 10.0, 0.0, 20.0, 0.0, 30.0, 0.0])[0]
+    other = Cubic.from_coords([0.0, 0.0, 0.0, 10.0, 0.0, 20.0, 0.0, 30.0])[0]
+    first, second = cubic.split(0.5)
+    merged = Morph.merge_pairs([(first, other), (second, other.reverse())], tolerance=0.0)
+    assert len(merged) == 2
+
+    first2, second2 = other.split(0.5)
+    (pair,) = Morph.merge_pairs([(first, first2), (second, second2)], tolerance=0.0)
+    assert Cubic.to_coords(pair) == pytest.approx(Cubic.to_coords([cubic, other]))
@@ -0,0 +1,43 @@
+import pytest
+
+from geometry.polygon_measure import DoubleMapper
+
+# wraps once: the last anchor pair crosses the 0.0/1.0 boundary on both sides
+ANCHORS = [(0.1, 0.7), (0.35, 0.9), (0.6, 0.15), (0.9, 0.4)]
+
+PROGRESS = [i / 64 for i in range(65)] + [x for x, _ in ANCHORS] + [0.0999999, 0.9000001]
+
+
+def test_map_many_matches_map():
+    mapper = DoubleMapper(*ANCHORS)
+    assert mapper.map_many(PROGRESS) == [mapper.map(x) for x in PROGRESS]
+
+
+def test_map_back_many_matches_map_back():
+    mapper = DoubleMapper(*ANCHORS)
+    targets = PROGRESS + [y for _, y in ANCHORS]
+    assert mapper.map_back_many(targets) == [mapper.map_back(y) for y in targets]
+
+
+def test_map_hits_anchors_and_round_trips():
+    mapper = DoubleMapper(*ANCHORS)
+    for x, y in ANCHORS:
+        assert mapper.map(x) == pytest.approx(y)
+        assert mapper.map_back(y) == pytest.approx(x)
+
+    for x, y in zip(PROGRESS, mapper.map_many(PROGRESS)):
+        back = mapper.map_back(y)
+        # 0.0 and 1.0 are the same point on the outline
+        assert min(abs(back - x), 1 - abs(back - x)) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_map_many_accepts_any_iterable():
+    mapper = DoubleMapper(*ANCHORS)
+    assert mapper.map_many(iter(PROGRESS)) == mapper.map_many(PROGRESS)
+    assert mapper.map_many([]) == []
+
+
+def test_map_many_rejects_progress_out_of_range():
+    mapper = DoubleMapper(*ANCHORS)
+    with pytest.raises(ValueError):
+        mapper.map_many([0.5, 1.5])
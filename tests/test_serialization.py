@@ -0,0 +1,89 @@
+import pytest
+
+from geometry.bezier_geometry import Cubic
+from morph import serialization
+from morph.bezier_morph import Morph
+from shapes import preset_registry
+
+
+@pytest.fixture(scope="module")
+def heart():
+    return preset_registry.polygon("heart")
+
+
+@pytest.fixture(scope="module")
+def pairs(heart):
+    return Morph.match(preset_registry.polygon("cookie_8"), heart)
+
+
+def features(polygon):
+    return [
+        (Cubic.to_coords(f.curves), f.type, f.is_convex) for f in polygon.features
+    ]
+
+
+def pair_coords(pairs):
+    return Cubic.to_coords([c for pair in pairs for c in pair])
+
+
+def test_polygon_round_trip(heart):
+    loaded = serialization.load_polygon(serialization.dump_polygon(heart))
+    assert features(loaded) == features(heart)
+    assert (loaded.center_x, loaded.center_y) == (heart.center_x, heart.center_y)
+
+
+def test_polygon_round_trip_float32(heart):
+    data = serialization.dump_polygon(heart, double=False)
+    assert len(data) < len(serialization.dump_polygon(heart))
+
+    loaded = serialization.load_polygon(data)
+    for (coords, *kind), (expected, *expected_kind) in zip(features(loaded), features(heart)):
+        assert kind == expected_kind
+        assert coords == pytest.approx(expected, abs=1e-3)
+
+
+def test_morph_round_trip(pairs):
+    loaded = serialization.load_morph(serialization.dump_morph(pairs))
+    assert pair_coords(loaded) == pair_coords(pairs)
+    assert loaded.plan == pairs.plan
+
+
+def test_morph_without_plan_round_trip(pairs):
+    loaded = serialization.load_morph(serialization.dump_morph(list(pairs)))
+    assert pair_coords(loaded) == pair_coords(pairs)
+    assert loaded.plan is None
+
+
+def test_text_round_trip(heart, pairs):
+    for data in (
+        serialization.dump_polygon(heart),
+        serialization.dump_polygon(heart, double=False),
+        serialization.dump_morph(pairs),
+    ):
+        assert serialization.from_text(serialization.to_text(data)) == data
+
+
+def test_load_file(tmp_path, heart, pairs):
+    polygon_path = tmp_path / "heart.cshp"
+    morph_path = tmp_path / "cookie_8-heart.cshp"
+    polygon_path.write_bytes(serialization.dump_polygon(heart))
+    morph_path.write_bytes(serialization.dump_morph(pairs))
+
+    assert features(serialization.load_file(str(polygon_path))) == features(heart)
+    loaded = serialization.load_file(str(morph_path))
+    assert pair_coords(loaded) == pair_coords(pairs)
+    assert loaded.plan == pairs.plan
+
+
+def test_rejects_invalid_buffers(heart, pairs):
+    data = serialization.dump_polygon(heart)
+    with pytest.raises(ValueError):
+        serialization.load_morph(data)
+    with pytest.raises(ValueError):
+        serialization.load_polygon(serialization.dump_morph(pairs))
+    with pytest.raises(ValueError):
+        serialization.load_polygon(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        serialization.load_polygon(data[:-1])
+    with pytest.raises(ValueError):
+        serialization.read_header(data[:16])
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from geometry.corner_rounding import CornerRounding
+from morph.cache import MorphCache
+from morph.service import AsyncMorphService, spec_fingerprint
+from shapes import preset_registry
+
+TRIANGLE = {"vertices": [250, 50, 450, 400, 50, 400], "rounding": CornerRounding(40)}
+
+
+@pytest.fixture
+def blocked_executor():
+    """A one-thread executor that runs nothing until the returned event is set."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    yield executor, release
+    release.set()
+    executor.shutdown()
+
+
+async def settle():
+    # lets scheduled tasks and done callbacks run
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_requests_share_one_computation():
+    async def main():
+        square = preset_registry.polygon("square")
+        async with AsyncMorphService() as service:
+            results = await asyncio.gather(
+                *(service.match(square, TRIANGLE) for _ in range(3))
+            )
+            return results, service.metrics
+
+    results, metrics = asyncio.run(main())
+    assert results[0] is results[1] is results[2]
+    assert (metrics.requests, metrics.computations, metrics.coalesced) == (3, 1, 2)
+    assert metrics.queue_depth == metrics.running == 0
+
+
+def test_cache_answers_repeated_requests():
+    async def main():
+        square = preset_registry.polygon("square")
+        async with AsyncMorphService(cache=MorphCache()) as service:
+            first = await service.match(square, TRIANGLE)
+            second = await service.match(square, TRIANGLE)
+            return first, second, service.metrics
+
+    first, second, metrics = asyncio.run(main())
+    assert second is first
+    assert (metrics.computations, metrics.cache_hits) == (1, 1)
+
+
+def test_cancelling_every_request_drops_the_queued_computation(blocked_executor):
+    executor, release = blocked_executor
+
+    async def main():
+        square, heart = preset_registry.polygon("square"), preset_registry.polygon("heart")
+        service = AsyncMorphService(executor)
+        running = asyncio.ensure_future(service.match(square, heart))
+        queued = [asyncio.ensure_future(service.match(heart, square)) for _ in range(2)]
+        await settle()
+        assert service.queue_depth == 1
+
+        queued[0].cancel()
+        await settle()
+        # the other request still waits on the computation
+        assert service.metrics.cancelled == 0
+        assert service.queue_depth == 1
+
+        queued[1].cancel()
+        await settle()
+        assert service.metrics.cancelled == 1
+        assert service.queue_depth == 0
+
+        # a new request for the cancelled key starts over
+        release.set()
+        again = await service.match(heart, square)
+        await running
+        return again, service.metrics
+
+    again, metrics = asyncio.run(main())
+    assert len(again) > 0
+    assert (metrics.requests, metrics.computations, metrics.coalesced) == (4, 3, 1)
+    assert metrics.queue_depth == metrics.running == 0
+
+
+def test_spec_fingerprint_ignores_number_spelling():
+    floats = dict(TRIANGLE, vertices=[float(v) for v in TRIANGLE["vertices"]])
+    explicit = dict(TRIANGLE, per_vertex_rounding=None, center_x=None)
+    assert spec_fingerprint(floats) == spec_fingerprint(TRIANGLE)
+    assert spec_fingerprint(explicit) == spec_fingerprint(TRIANGLE)
+    assert spec_fingerprint(dict(TRIANGLE, center_x=250)) != spec_fingerprint(TRIANGLE)
@@ -0,0 +1,64 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from geometry.bezier_geometry import Cubic
+from morph.bezier_morph import Morph
+from morph.shared import SharedMorph, SharedMorphDescriptor, SharedMorphStore
+from shapes import preset_registry
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    return Morph.match(preset_registry.polygon("square"), preset_registry.polygon("heart"))
+
+
+def shared_outline(descriptor: SharedMorphDescriptor, progress: float):
+    # runs in a worker process
+    with SharedMorph(descriptor) as shared:
+        return Cubic.to_coords(shared.as_cubics(progress))
+
+
+def test_shared_morph_round_trip(pairs):
+    with SharedMorphStore() as store:
+        descriptor = store.publish(pairs)
+        assert descriptor.pair_count == len(pairs)
+        assert store.nbytes == len(pairs) * 16 * 8
+
+        with SharedMorph(descriptor) as shared:
+            assert shared.pairs() == list(pairs)
+            assert shared.pair(3) == pairs[3]
+            for t in (0.0, 0.4, 1.0):
+                assert Cubic.to_coords(shared.as_cubics(t)) == pytest.approx(
+                    Cubic.to_coords(Morph.as_cubics(pairs, t))
+                )
+
+
+def test_publish_deduplicates(pairs):
+    with SharedMorphStore() as store:
+        first = store.publish(pairs)
+        assert store.publish(list(pairs)) == first
+        assert store.publish(pairs, key="square->heart") != first
+        assert store.publish(pairs[:2], key="square->heart").pair_count == len(pairs)
+        assert len(store) == 2
+
+
+def test_close_unlinks_segments(pairs):
+    store = SharedMorphStore()
+    descriptor = store.publish(pairs)
+    store.close()
+
+    assert len(store) == 0
+    with pytest.raises(FileNotFoundError):
+        SharedMorph(descriptor)
+
+
+def test_workers_attach_by_descriptor(pairs):
+    with SharedMorphStore() as store:
+        descriptor = store.publish(pairs)
+        assert pickle.loads(pickle.dumps(descriptor)) == descriptor
+
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            outline = pool.submit(shared_outline, descriptor, 0.5).result()
+        assert outline == pytest.approx(Cubic.to_coords(Morph.as_cubics(pairs, 0.5)))